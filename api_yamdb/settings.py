@@ -56,9 +56,41 @@ DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.sqlite3',
         'NAME': os.path.join(BASE_DIR, 'db.sqlite3'),
+        'TEST': {
+            'NAME': os.path.join(BASE_DIR, 'test_db.sqlite3'),
+        },
     }
 }
 
+# Версии пространств кэша (ETag, списки категорий и жанров), счётчики
+# троттлинга и версии пользователей хранятся в кэше default. Он должен быть
+# общим для всех процессов приложения и поддерживать атомарный incr без
+# обхода всех записей при каждой записи: в production это memcached, например
+# YAMDB_CACHE_BACKEND=django.core.cache.backends.memcached.PyLibMCCache и
+# YAMDB_CACHE_LOCATION=127.0.0.1:11211. Без переменных окружения используется
+# LocMemCache — только для разработки, manage.py check выводит yamdb.W001.
+CACHES = {
+    'default': {
+        'BACKEND': os.environ.get(
+            'YAMDB_CACHE_BACKEND',
+            'django.core.cache.backends.locmem.LocMemCache'
+        ),
+        'LOCATION': os.environ.get('YAMDB_CACHE_LOCATION', ''),
+    }
+}
+
+LIST_CACHE_TIMEOUT = 60 * 15
+
+BULK_MAX_ITEMS = 1000
+
+MAX_PAGE_SIZE = 1000
+
+TOP_TITLES_SIZE = 100
+TOP_TITLES_MIN_REVIEWS = 10
+
+JWT_USER_CACHE_SIZE = 1024
+JWT_USER_CACHE_TIMEOUT = 60
+
 AUTH_USER_MODEL = 'yamdb.CustomUser'
 
 AUTH_PASSWORD_VALIDATORS = [
@@ -92,15 +124,25 @@ STATICFILES_DIRS = (os.path.join(BASE_DIR, 'static/'),)
 
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': [
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        'yamdb.authentication.CachedJWTAuthentication',
     ],
     'DEFAULT_PERMISSION_CLASSES': [
         'rest_framework.permissions.IsAuthenticated',
     ],
-    'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.PageNumberPagination',
+    'DEFAULT_RENDERER_CLASSES': [
+        'yamdb.renderers.FastJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ],
+    'DEFAULT_PAGINATION_CLASS': 'yamdb.pagination.LimitedPageNumberPagination',
     'PAGE_SIZE': 100,
     'DEFAULT_FILTER_BACKENDS': (
-        'django_filters.rest_framework.DjangoFilterBackend',)
+        'django_filters.rest_framework.DjangoFilterBackend',),
+    'DEFAULT_THROTTLE_RATES': {
+        'auth_email': '5/min',
+        'auth_token': '10/min',
+        'content_create': '30/min',
+        'admin_write': '600/min',
+    },
 }
 
 SIMPLE_JWT = {
@@ -111,6 +153,11 @@ SIMPLE_JWT = {
 EMAIL_BACKEND = 'django.core.mail.backends.filebased.EmailBackend'
 EMAIL_FILE_PATH = os.path.join(BASE_DIR, 'sent_emails')
 
+EMAIL_QUEUE_BATCH_SIZE = 100
+EMAIL_QUEUE_MAX_ATTEMPTS = 5
+EMAIL_QUEUE_RETRY_DELAY = 60
+EMAIL_QUEUE_LEASE = 60 * 5
+
 ADMINS = (('admin', 'admin@yamdb.com'), )
 
 AUTHENTICATION_BACKENDS = [
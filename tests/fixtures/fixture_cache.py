@@ -0,0 +1,27 @@
+import pytest
+
+
+@pytest.fixture(autouse=True)
+def clear_cache(settings, tmp_path):
+    # Отдельное расположение на каждый тест: кэш запущенного сервера и
+    # параллельных прогонов не затрагивается.
+    from django.core.cache import cache
+
+    from yamdb.authentication import user_cache
+    settings.CACHES = {
+        alias: {**config, 'LOCATION': str(tmp_path / f'cache-{alias}')}
+        for alias, config in settings.CACHES.items()
+    }
+    user_cache.clear()
+    yield
+    cache.clear()
+    user_cache.clear()
+
+
+@pytest.fixture
+def no_throttling(monkeypatch):
+    from yamdb.throttling import SlidingWindowRateThrottle
+    monkeypatch.setattr(
+        SlidingWindowRateThrottle, 'THROTTLE_RATES',
+        dict.fromkeys(SlidingWindowRateThrottle.THROTTLE_RATES)
+    )
@@ -0,0 +1,74 @@
+import pytest
+
+from yamdb.views import CommentsViewSet, ReviewViewSet
+
+from .common import create_comments, create_reviews
+
+
+class Test07QueriesAPI:
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_titles_list_queries(self, client, user_client, admin,
+                                    django_assert_num_queries):
+        _, titles, _, _ = create_reviews(user_client, admin)
+        with django_assert_num_queries(3):
+            response = client.get('/api/v1/titles/')
+        assert response.status_code == 200, (
+            'Проверьте, что при GET запросе `/api/v1/titles/` возвращается статус 200'
+        )
+        assert len(response.json()['results']) == len(titles), (
+            'Проверьте, что при GET запросе `/api/v1/titles/` возвращаете все произведения'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_titles_detail_queries(self, client, user_client, admin,
+                                      django_assert_num_queries):
+        _, titles, _, _ = create_reviews(user_client, admin)
+        with django_assert_num_queries(2):
+            response = client.get(f'/api/v1/titles/{titles[0]["id"]}/')
+        assert response.status_code == 200, (
+            'Проверьте, что при GET запросе `/api/v1/titles/{title_id}/` возвращается статус 200'
+        )
+        assert len(response.json()['genre']) == len(titles[0]['genre']), (
+            'Проверьте, что при GET запросе `/api/v1/titles/{title_id}/` возвращаете жанры произведения'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_03_reviews_comments_author_queries(self, client, user_client,
+                                                admin, monkeypatch,
+                                                django_assert_num_queries):
+        comments, reviews, titles, _, _ = create_comments(user_client, admin)
+        reviews_url = f'/api/v1/titles/{titles[0]["id"]}/reviews/'
+        comments_url = f'{reviews_url}{reviews[0]["id"]}/comments/'
+        monkeypatch.setattr(ReviewViewSet, 'values_reader_class', None)
+        monkeypatch.setattr(CommentsViewSet, 'values_reader_class', None)
+        cases = [
+            (reviews_url, 3, {}),
+            (reviews_url, 2, {'cursor': ''}),
+            (reviews_url, 3, {'fields': 'id,author'}),
+            (f'{reviews_url}{reviews[0]["id"]}/', 2, {}),
+            (comments_url, 3, {}),
+            (f'{comments_url}{comments[0]["id"]}/', 2, {}),
+        ]
+        for url, queries, params in cases:
+            with django_assert_num_queries(queries):
+                response = client.get(url, params)
+            assert response.status_code == 200, (
+                f'Проверьте, что при GET запросе `{url}` возвращается статус 200'
+            )
+            data = response.json()
+            items = data['results'] if 'results' in data else [data]
+            assert all(item['author'] for item in items), (
+                f'Проверьте, что при GET запросе `{url}` автор загружается '
+                'вместе с объектом, без отдельного запроса на каждую строку'
+            )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_04_review_update_queries(self, user_client, admin,
+                                      django_assert_max_num_queries):
+        reviews, titles, _, _ = create_reviews(user_client, admin)
+        url = f'/api/v1/titles/{titles[0]["id"]}/reviews/{reviews[0]["id"]}/'
+        with django_assert_max_num_queries(12):
+            response = user_client.patch(url, data={'score': 7})
+        assert response.status_code == 200
+        assert response.json()['author'] == admin.username
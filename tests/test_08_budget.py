@@ -0,0 +1,192 @@
+import json
+import math
+import os
+import time
+
+import pytest
+from django.contrib.auth import get_user_model
+from django.contrib.auth.tokens import default_token_generator
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+
+from yamdb.models import (Category, Comment, Genre, Review, Title,
+                          TitleRanking, TitleScore)
+
+from .common import auth_client
+
+SCALE = float(os.environ.get('YAMDB_BUDGET_SCALE', 1))
+REPEAT = int(os.environ.get('YAMDB_BUDGET_REPEAT', 20))
+REPORT = os.environ.get('YAMDB_BUDGET_REPORT')
+# Время ответа зависит от нагрузки на машину: по умолчанию проверяется
+# только число запросов к БД, p95 — с YAMDB_BUDGET_LATENCY=1.
+CHECK_LATENCY = os.environ.get('YAMDB_BUDGET_LATENCY') == '1'
+
+TITLES = max(int(2000 * SCALE), 1)
+AUTHORS = 10
+CATEGORIES = 20
+GENRES = 30
+
+# name: (method, url, client, max queries, p95 ms)
+BUDGETS = {
+    'users-list': ('get', '/api/v1/users/', 'admin', 3, 300),
+    'users-detail': ('get', '/api/v1/users/{username}/', 'admin', 2, 100),
+    'users-me': ('get', '/api/v1/users/me/', 'admin', 1, 100),
+    'titles-list': ('get', '/api/v1/titles/', 'anon', 3, 400),
+    'titles-list-page': ('get', '/api/v1/titles/?page_size=1000&count=false',
+                         'anon', 2, 400),
+    'titles-detail': ('get', '/api/v1/titles/{title}/', 'anon', 2, 100),
+    'titles-stats': ('get', '/api/v1/titles/{title}/stats/', 'anon', 2, 100),
+    'titles-top': ('get', '/api/v1/titles/top/', 'anon', 3, 100),
+    'titles-bulk': ('patch', '/api/v1/titles/bulk/', 'admin', 5, 200),
+    'categories-list': ('get', '/api/v1/categories/', 'anon', 2, 100),
+    'categories-bulk': ('patch', '/api/v1/categories/bulk/', 'admin', 3,
+                        200),
+    'genres-list': ('get', '/api/v1/genres/', 'anon', 2, 100),
+    'genres-bulk': ('patch', '/api/v1/genres/bulk/', 'admin', 3, 200),
+    'reviews-list': ('get', '/api/v1/titles/{title}/reviews/', 'anon', 3, 200),
+    'reviews-detail': ('get', '/api/v1/titles/{title}/reviews/{review}/',
+                       'anon', 2, 100),
+    'comments-list': ('get',
+                      '/api/v1/titles/{title}/reviews/{review}/comments/',
+                      'anon', 3, 200),
+    'comments-detail': ('get',
+                        '/api/v1/titles/{title}/reviews/{review}/comments/'
+                        '{comment}/', 'anon', 2, 100),
+    'auth-email': ('post', '/api/v1/auth/email/', 'admin', 3, 200),
+    'auth-token': ('post', '/api/v1/auth/token/', 'anon', 2, 200),
+}
+
+
+def seed():
+    user_model = get_user_model()
+    admin = user_model.objects.create_superuser(
+        username='BudgetAdmin', email='budget-admin@yamdb.fake',
+        password='1234567'
+    )
+    user_model.objects.bulk_create(
+        user_model(username=f'author{i}', email=f'author{i}@yamdb.fake')
+        for i in range(AUTHORS)
+    )
+    authors = list(user_model.objects.filter(username__startswith='author'))
+    Category.objects.bulk_create(
+        Category(name=f'Категория {i}', slug=f'category-{i}')
+        for i in range(CATEGORIES)
+    )
+    Genre.objects.bulk_create(
+        Genre(name=f'Жанр {i}', slug=f'genre-{i}') for i in range(GENRES)
+    )
+    categories = list(Category.objects.all())
+    genres = list(Genre.objects.all())
+    Title.objects.bulk_create(
+        Title(name=f'Произведение {i}', year=2000 + i % 20,
+              category=categories[i % CATEGORIES],
+              description='Описание ' * 20)
+        for i in range(TITLES)
+    )
+    titles = list(Title.objects.all())
+    through = Title.genre.through
+    through.objects.bulk_create(
+        through(title_id=title.pk, genre_id=genres[(title.pk + i) % GENRES].pk)
+        for title in titles for i in range(3)
+    )
+    Review.objects.bulk_create(
+        Review(title=title, author=author, text='Отзыв ' * 10,
+               score=(title.pk + author.pk) % 10 + 1)
+        for title in titles for author in authors
+    )
+    Comment.objects.bulk_create(
+        Comment(title_id=review.title_id, review=review,
+                author=authors[review.pk % AUTHORS], text='Комментарий')
+        for review in Review.objects.all().only('id', 'title_id')
+    )
+    Title.rebuild_ratings()
+    TitleScore.rebuild()
+    TitleRanking.refresh()
+    return admin
+
+
+def measure(request_func):
+    durations = []
+    queries = 0
+    status_code = None
+    for _ in range(REPEAT):
+        with CaptureQueriesContext(connection) as context:
+            start = time.perf_counter()
+            response = request_func()
+            durations.append((time.perf_counter() - start) * 1000)
+        queries = max(queries, len(context.captured_queries))
+        status_code = response.status_code
+    durations.sort()
+    p95 = durations[max(math.ceil(len(durations) * 0.95) - 1, 0)]
+    return status_code, queries, p95
+
+
+class Test08BudgetAPI:
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_endpoint_budgets(self, no_throttling):
+        admin = seed()
+        title = Title.objects.first()
+        review = title.reviews.first()
+        comment = review.comments.first()
+        kwargs = {
+            'username': admin.username,
+            'title': title.pk,
+            'review': review.pk,
+            'comment': comment.pk,
+        }
+        payloads = {
+            'auth-email': lambda: {'email': admin.email},
+            'titles-bulk': lambda: [{'id': title.pk, 'name': title.name}],
+            'categories-bulk': lambda: [{'name': 'Категория 0',
+                                         'slug': 'category-0'}],
+            'genres-bulk': lambda: [{'name': 'Жанр 0', 'slug': 'genre-0'}],
+            'auth-token': lambda: {
+                'email': admin.email,
+                'confirmation_code': default_token_generator.make_token(
+                    get_user_model().objects.get(pk=admin.pk)
+                ),
+            },
+        }
+        clients = {'anon': APIClient(), 'admin': auth_client(admin)}
+
+        report = {}
+        violations = []
+        for name, (method, url, client_name, max_queries, max_p95) in (
+                BUDGETS.items()):
+            client = clients[client_name]
+            path = url.format(**kwargs)
+            payload = payloads.get(name, lambda: None)()
+            status_code, queries, p95 = measure(
+                lambda: getattr(client, method)(path, data=payload,
+                                                format='json')
+            )
+            report[name] = {
+                'status': status_code,
+                'queries': queries,
+                'max_queries': max_queries,
+                'p95_ms': round(p95, 2),
+                'max_p95_ms': max_p95,
+            }
+            if status_code >= 400:
+                violations.append(f'{name}: статус {status_code}')
+            if queries > max_queries:
+                violations.append(
+                    f'{name}: {queries} запросов к БД, бюджет {max_queries}'
+                )
+            if CHECK_LATENCY and p95 > max_p95:
+                violations.append(
+                    f'{name}: p95 {p95:.1f} мс, бюджет {max_p95} мс'
+                )
+
+        if REPORT:
+            with open(REPORT, 'w', encoding='utf-8') as report_file:
+                json.dump({'scale': SCALE, 'repeat': REPEAT,
+                           'endpoints': report},
+                          report_file, ensure_ascii=False, indent=2,
+                          sort_keys=True)
+        assert not violations, (
+            'Проверьте бюджеты запросов и времени ответа: '
+            + '; '.join(violations)
+        )
@@ -0,0 +1,44 @@
+import pytest
+from django.core.management import call_command
+
+from yamdb.models import Comment, CustomUser, Genre, Review, Title
+
+
+class Test09LoadCSV:
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_load_csv(self, client):
+        call_command('load_csv', batch_size=7)
+        assert Title.objects.count() == 32, (
+            'Проверьте, что команда `load_csv` загружает все произведения'
+        )
+        assert Genre.objects.count() == 15, (
+            'Проверьте, что команда `load_csv` загружает все жанры'
+        )
+        assert Title.genre.through.objects.count() == 42, (
+            'Проверьте, что команда `load_csv` загружает связи жанров и произведений'
+        )
+        assert CustomUser.objects.count() == 5, (
+            'Проверьте, что команда `load_csv` загружает всех пользователей'
+        )
+        assert Review.objects.count() > 0 and Comment.objects.count() > 0, (
+            'Проверьте, что команда `load_csv` загружает отзывы и комментарии'
+        )
+        review = Review.objects.get(pk=1)
+        assert review.pub_date.year == 2019, (
+            'Проверьте, что команда `load_csv` сохраняет дату публикации из файла'
+        )
+        comment = Comment.objects.get(pk=1)
+        assert comment.title_id == comment.review.title_id, (
+            'Проверьте, что команда `load_csv` определяет произведение комментария по отзыву'
+        )
+        response = client.get(f'/api/v1/titles/{review.title_id}/')
+        assert response.json().get('rating') is not None, (
+            'Проверьте, что команда `load_csv` пересчитывает рейтинг произведений'
+        )
+        stats = client.get(f'/api/v1/titles/{review.title_id}/stats/').json()
+        assert stats['count'] == Review.objects.filter(
+            title_id=review.title_id
+        ).count(), (
+            'Проверьте, что команда `load_csv` пересчитывает распределение оценок'
+        )
@@ -0,0 +1,112 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from yamdb.models import Title
+from yamdb.pagination import (LimitedPageNumberPagination,
+                              PubDateCursorPagination)
+
+from .common import create_comments, create_reviews
+
+
+class Test10PaginationAPI:
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_reviews_cursor(self, client, user_client, admin, monkeypatch):
+        monkeypatch.setattr(PubDateCursorPagination, 'page_size', 2)
+        reviews, titles, _, _ = create_reviews(user_client, admin)
+        url = f'/api/v1/titles/{titles[0]["id"]}/reviews/'
+        with CaptureQueriesContext(connection) as context:
+            response = client.get(url, {'cursor': ''})
+        assert response.status_code == 200, (
+            f'Проверьте, что при GET запросе `{url}?cursor=` возвращается статус 200'
+        )
+        assert not any('COUNT(' in query['sql'] for query in context.captured_queries), (
+            f'Проверьте, что при GET запросе `{url}?cursor=` не выполняется запрос COUNT'
+        )
+        data = response.json()
+        assert 'count' not in data and data['next'], (
+            f'Проверьте, что при GET запросе `{url}?cursor=` возвращается ссылка `next` без `count`'
+        )
+        ids = [review['id'] for review in data['results']]
+        data = client.get(data['next']).json()
+        ids += [review['id'] for review in data['results']]
+        assert sorted(ids) == sorted(review['id'] for review in reviews), (
+            f'Проверьте, что при GET запросе `{url}?cursor=` можно получить все отзывы'
+        )
+        assert data['next'] is None, (
+            f'Проверьте, что при GET запросе `{url}?cursor=` на последней странице `next` равен None'
+        )
+        data = client.get(url).json()
+        assert data['count'] == len(reviews), (
+            f'Проверьте, что при GET запросе `{url}` без `cursor` используется постраничная пагинация'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_comments_cursor(self, client, user_client, admin):
+        comments, reviews, titles, _, _ = create_comments(user_client, admin)
+        url = (f'/api/v1/titles/{titles[0]["id"]}/reviews/'
+               f'{reviews[0]["id"]}/comments/')
+        response = client.get(url, {'cursor': ''})
+        assert response.status_code == 200, (
+            f'Проверьте, что при GET запросе `{url}?cursor=` возвращается статус 200'
+        )
+        data = response.json()
+        assert [comment['id'] for comment in data['results']] == [
+            comment['id'] for comment in reversed(comments)
+        ], (
+            f'Проверьте, что при GET запросе `{url}?cursor=` комментарии отсортированы по дате публикации'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_03_page_size(self, client, monkeypatch):
+        monkeypatch.setattr(LimitedPageNumberPagination, 'max_page_size', 3)
+        Title.objects.bulk_create(
+            Title(name=f'Произведение {i}', year=2000) for i in range(5)
+        )
+        url = '/api/v1/titles/'
+        data = client.get(url, {'page_size': 2}).json()
+        assert data['count'] == 5 and len(data['results']) == 2, (
+            f'Проверьте, что при GET запросе `{url}?page_size=2` возвращается 2 объекта'
+        )
+        data = client.get(url, {'page_size': 100}).json()
+        assert len(data['results']) == 3, (
+            f'Проверьте, что `page_size` в запросе `{url}` ограничен `MAX_PAGE_SIZE`'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_04_without_count(self, client):
+        Title.objects.bulk_create(
+            Title(name=f'Произведение {i}', year=2000) for i in range(5)
+        )
+        url = '/api/v1/titles/'
+        with CaptureQueriesContext(connection) as context:
+            response = client.get(url, {'page_size': 2, 'count': 'false'})
+        assert response.status_code == 200, (
+            f'Проверьте, что при GET запросе `{url}?count=false` возвращается статус 200'
+        )
+        assert not any('COUNT(' in query['sql'] for query in context.captured_queries), (
+            f'Проверьте, что при GET запросе `{url}?count=false` не выполняется запрос COUNT'
+        )
+        data = response.json()
+        assert 'count' not in data and data['previous'] is None, (
+            f'Проверьте, что при GET запросе `{url}?count=false` в ответе нет `count`'
+        )
+        ids = [title['id'] for title in data['results']]
+        pages = 1
+        while data['next']:
+            data = client.get(data['next']).json()
+            assert data['previous'], (
+                f'Проверьте ссылку `previous` при GET запросе `{url}?count=false`'
+            )
+            ids += [title['id'] for title in data['results']]
+            pages += 1
+        assert pages == 3 and sorted(ids) == sorted(
+            Title.objects.values_list('id', flat=True)
+        ), (
+            f'Проверьте, что при GET запросе `{url}?count=false` можно получить все произведения'
+        )
+        response = client.get(url, {'count': 'false', 'page': 10})
+        assert response.status_code == 404, (
+            f'Проверьте, что при GET запросе `{url}?count=false` несуществующая страница возвращает 404'
+        )
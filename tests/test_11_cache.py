@@ -0,0 +1,117 @@
+import os
+import subprocess
+import sys
+
+import pytest
+from django.conf import settings
+from django.core.cache import cache
+from django.test import override_settings
+
+from yamdb.caching import VERSION_KEY
+from yamdb.checks import check_shared_cache
+from yamdb.models import Genre
+
+from .common import create_categories, create_genre
+
+
+class Test11CacheAPI:
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_categories_cache(self, client, user_client,
+                                 django_assert_num_queries):
+        categories = create_categories(user_client)
+        response = client.get('/api/v1/categories/')
+        etag = response['ETag']
+        assert etag, (
+            'Проверьте, что при GET запросе `/api/v1/categories/` возвращается заголовок `ETag`'
+        )
+        with django_assert_num_queries(0):
+            cached = client.get('/api/v1/categories/')
+        assert cached.json() == response.json(), (
+            'Проверьте, что при повторном GET запросе `/api/v1/categories/` ответ берётся из кэша'
+        )
+        with django_assert_num_queries(0):
+            response = client.get('/api/v1/categories/',
+                                  HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == 304, (
+            'Проверьте, что при GET запросе `/api/v1/categories/` с актуальным `If-None-Match` '
+            'возвращается статус 304'
+        )
+        user_client.delete(f'/api/v1/categories/{categories[0]["slug"]}/')
+        response = client.get('/api/v1/categories/',
+                              HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == 200, (
+            'Проверьте, что после удаления категории кэш `/api/v1/categories/` сбрасывается'
+        )
+        assert response.json()['count'] == len(categories) - 1, (
+            'Проверьте, что после удаления категории кэш `/api/v1/categories/` сбрасывается'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_genres_cache(self, client, user_client):
+        genres = create_genre(user_client)
+        response = client.get('/api/v1/genres/', {'search': 'Драма'})
+        assert response.json()['count'] == 1, (
+            'Проверьте, что поиск `/api/v1/genres/?search=` кэшируется отдельно от полного списка'
+        )
+        response = client.get('/api/v1/genres/')
+        assert response.json()['count'] == len(genres), (
+            'Проверьте, что поиск `/api/v1/genres/?search=` кэшируется отдельно от полного списка'
+        )
+        Genre.objects.create(name='Драма 2', slug='drama-2')
+        response = client.get('/api/v1/genres/', {'search': 'Драма'})
+        assert response.json()['count'] == 2, (
+            'Проверьте, что изменения жанров вне API (например, в админке) сбрасывают кэш'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_03_versions_shared_between_workers(self, client, user_client,
+                                                settings):
+        # memcached в тестах недоступен: общий для процессов кэш здесь —
+        # файловый, в расположении кэша теста (tmp_path, см. clear_cache).
+        backend = 'django.core.cache.backends.filebased.FileBasedCache'
+        location = settings.CACHES['default']['LOCATION']
+        settings.CACHES = {'default': {'BACKEND': backend,
+                                       'LOCATION': location}}
+
+        def other_worker_version():
+            # Версия, которую видит другой процесс приложения.
+            result = subprocess.run(
+                [sys.executable, 'manage.py', 'shell', '-c',
+                 'from django.core.cache import cache; '
+                 f'print(cache.get({key!r}))'],
+                cwd=settings.BASE_DIR, capture_output=True, text=True,
+                check=True, env={**os.environ,
+                                 'YAMDB_CACHE_BACKEND': backend,
+                                 'YAMDB_CACHE_LOCATION': location}
+            )
+            return result.stdout.strip()
+
+        key = VERSION_KEY.format('genres')
+        etag = client.get('/api/v1/genres/')['ETag']
+        version = other_worker_version()
+        assert version == str(cache.get(key)), (
+            'Проверьте, что версии пространств хранятся в общем кэше'
+        )
+        create_genre(user_client)
+        assert other_worker_version() == str(cache.get(key)) != version, (
+            'Проверьте, что изменение версии видно другим процессам'
+        )
+        assert client.get('/api/v1/genres/',
+                          HTTP_IF_NONE_MATCH=etag).status_code == 200
+
+    def test_04_cache_backend_check(self):
+        backends = {
+            'django.core.cache.backends.locmem.LocMemCache': ['yamdb.W001'],
+            'django.core.cache.backends.filebased.FileBasedCache': [
+                'yamdb.W002'
+            ],
+            'django.core.cache.backends.memcached.PyLibMCCache': [],
+        }
+        for backend, expected in backends.items():
+            with override_settings(CACHES={'default': {'BACKEND': backend}}):
+                warnings = check_shared_cache(None)
+            assert [warning.id for warning in warnings] == expected, (
+                'Проверьте, что кэш, локальный для процесса или с '
+                'неатомарным incr, вызывает предупреждение'
+            )
@@ -0,0 +1,45 @@
+import pytest
+from django.db import IntegrityError
+
+from yamdb.models import Comment, Review
+
+from .common import create_reviews
+
+
+class Test12Indexes:
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_review_title_index(self, user_client, admin):
+        _, titles, _, _ = create_reviews(user_client, admin)
+        plan = Review.objects.filter(
+            title_id=titles[0]['id']
+        ).order_by('-pub_date').explain()
+        assert 'review_title_pub_date_idx' in plan, (
+            'Проверьте, что выборка отзывов произведения использует индекс `(title, -pub_date)`'
+        )
+        assert 'TEMP B-TREE' not in plan, (
+            'Проверьте, что сортировка отзывов по `pub_date` выполняется по индексу'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_comment_review_index(self, user_client, admin):
+        reviews, _, _, _ = create_reviews(user_client, admin)
+        plan = Comment.objects.filter(
+            review_id=reviews[0]['id']
+        ).order_by('-pub_date').explain()
+        assert 'comment_review_pub_date_idx' in plan, (
+            'Проверьте, что выборка комментариев отзыва использует индекс `(review, -pub_date)`'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_03_review_author_title_unique(self, user_client, admin):
+        _, titles, _, _ = create_reviews(user_client, admin)
+        plan = Review.objects.filter(
+            author=admin, title_id=titles[0]['id']
+        ).explain()
+        assert 'INDEX' in plan and 'author_id=? AND title_id=?' in plan, (
+            'Проверьте, что проверка отзыва автора использует уникальный индекс `(author, title)`'
+        )
+        with pytest.raises(IntegrityError):
+            Review.objects.create(author=admin, title_id=titles[0]['id'],
+                                  text='Дубликат', score=5)
@@ -0,0 +1,50 @@
+import pytest
+
+from .common import create_titles
+
+
+class Test13SearchAPI:
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_titles_search(self, client, user_client):
+        titles, _, _ = create_titles(user_client)
+        response = client.get('/api/v1/titles/', {'search': 'пово'})
+        assert response.status_code == 200, (
+            'Проверьте, что при GET запросе `/api/v1/titles/?search=` возвращается статус 200'
+        )
+        data = response.json()
+        assert data['count'] == 1 and data['results'][0]['id'] == titles[0]['id'], (
+            'Проверьте, что `/api/v1/titles/?search=` ищет по началу слова в названии'
+        )
+        response = client.get('/api/v1/titles/', {'search': 'драма'})
+        assert [title['id'] for title in response.json()['results']] == [titles[1]['id']], (
+            'Проверьте, что `/api/v1/titles/?search=` ищет по описанию произведения'
+        )
+        response = client.get('/api/v1/titles/', {'search': '"*('})
+        assert response.status_code == 200 and response.json()['count'] == 0, (
+            'Проверьте, что `/api/v1/titles/?search=` корректно обрабатывает служебные символы'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_titles_search_ranking(self, client, user_client):
+        titles, _, _ = create_titles(user_client)
+        data = {'name': 'Сериал', 'year': 2021,
+                'description': 'Продолжение, проект года'}
+        user_client.post('/api/v1/titles/', data=data)
+        response = client.get('/api/v1/titles/', {'search': 'проект'})
+        results = response.json()['results']
+        assert [title['name'] for title in results] == ['Проект', 'Сериал'], (
+            'Проверьте, что `/api/v1/titles/?search=` выше ранжирует совпадения в названии'
+        )
+        user_client.patch(f'/api/v1/titles/{titles[1]["id"]}/',
+                          data={'name': 'Старый фильм'})
+        response = client.get('/api/v1/titles/', {'search': 'проект'})
+        results = response.json()['results']
+        assert [title['name'] for title in results] == ['Сериал'], (
+            'Проверьте, что поисковый индекс обновляется при изменении произведения'
+        )
+        user_client.delete(f'/api/v1/titles/{titles[0]["id"]}/')
+        response = client.get('/api/v1/titles/', {'search': 'поворот'})
+        assert response.json()['count'] == 0, (
+            'Проверьте, что поисковый индекс обновляется при удалении произведения'
+        )
@@ -0,0 +1,55 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from .common import create_titles
+
+
+class Test14TitleFiltersAPI:
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_genre_any_all(self, client, user_client):
+        titles, _, genres = create_titles(user_client)
+        url = '/api/v1/titles/'
+        slugs = f'{genres[0]["slug"]},{genres[2]["slug"]}'
+        response = client.get(url, {'genre': slugs})
+        assert sorted(title['id'] for title in response.json()['results']) == sorted(
+            title['id'] for title in titles
+        ), (
+            f'Проверьте, что `{url}?genre=a,b` возвращает произведения с любым из жанров'
+        )
+        slugs = f'{genres[0]["slug"]},{genres[1]["slug"]}'
+        with CaptureQueriesContext(connection) as context:
+            response = client.get(url, {'genre': slugs, 'genre_match': 'all'})
+        data = response.json()
+        assert data['count'] == 1 and data['results'][0]['id'] == titles[0]['id'], (
+            f'Проверьте, что `{url}?genre=a,b&genre_match=all` возвращает произведения со всеми жанрами'
+        )
+        count_sql = next(query['sql'] for query in context.captured_queries
+                         if 'COUNT(' in query['sql'])
+        assert 'DISTINCT' not in count_sql and 'GROUP BY' not in count_sql, (
+            f'Проверьте, что фильтр `{url}?genre=` не размножает строки и не требует DISTINCT'
+        )
+        response = client.get(url, {'genre': genres[0]['slug'][:-1]})
+        assert response.json()['count'] == 0, (
+            f'Проверьте, что фильтр `{url}?genre=` сравнивает slug точно'
+        )
+        response = client.get(url, {'genre': slugs, 'genre_match': 'some'})
+        assert response.status_code == 400, (
+            f'Проверьте, что `{url}?genre_match=` принимает только `any` или `all`'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_category_multi(self, client, user_client):
+        titles, categories, _ = create_titles(user_client)
+        url = '/api/v1/titles/'
+        response = client.get(url, {'category': ','.join(
+            category['slug'] for category in categories
+        )})
+        assert response.json()['count'] == len(titles), (
+            f'Проверьте, что `{url}?category=a,b` возвращает произведения из любой категории'
+        )
+        response = client.get(url, {'category': categories[0]['slug'][:-1]})
+        assert response.json()['count'] == 0, (
+            f'Проверьте, что фильтр `{url}?category=` сравнивает slug точно'
+        )
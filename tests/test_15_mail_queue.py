@@ -0,0 +1,115 @@
+from datetime import timedelta
+
+import pytest
+from django.core import mail
+from django.core.mail.backends.base import BaseEmailBackend
+from django.core.management import call_command
+from django.db import connection
+from django.utils import timezone
+
+from yamdb.mail import deliver_queued_mail, mail_queue_stats
+from yamdb.models import QueuedEmail
+
+
+class FailingEmailBackend(BaseEmailBackend):
+
+    def send_messages(self, email_messages):
+        raise ConnectionError('SMTP недоступен')
+
+
+class RecordingEmailBackend(BaseEmailBackend):
+    calls = []
+
+    def send_messages(self, email_messages):
+        # Во время отправки транзакция не открыта, а пачка уже забрана:
+        # параллельный обработчик её не получит.
+        self.calls.append((connection.in_atomic_block,
+                           deliver_queued_mail()))
+        return len(email_messages)
+
+
+class Test15MailQueue:
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_auth_email_queued(self, user_client, admin):
+        response = user_client.post('/api/v1/auth/email/',
+                                    data={'email': admin.email})
+        assert response.status_code == 200, (
+            'Проверьте, что при POST запросе `/api/v1/auth/email/` возвращается статус 200'
+        )
+        assert len(mail.outbox) == 0 and QueuedEmail.objects.count() == 1, (
+            'Проверьте, что `/api/v1/auth/email/` ставит письмо в очередь, а не отправляет его в запросе'
+        )
+        assert mail_queue_stats()['pending'] == 1, (
+            'Проверьте, что статистика очереди учитывает неотправленные письма'
+        )
+        call_command('send_queued_mail')
+        assert len(mail.outbox) == 1 and mail.outbox[0].to == [admin.email], (
+            'Проверьте, что команда `send_queued_mail` отправляет письма из очереди'
+        )
+        assert mail_queue_stats()['pending'] == 0, (
+            'Проверьте, что отправленные письма не остаются в очереди'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_retry_with_backoff(self, settings):
+        QueuedEmail.objects.create(subject='Тема', body='Текст',
+                                   from_email='from@yamdb.fake',
+                                   recipient='to@yamdb.fake')
+        settings.EMAIL_BACKEND = 'tests.test_15_mail_queue.FailingEmailBackend'
+        assert deliver_queued_mail() == (0, 1), (
+            'Проверьте, что ошибка отправки учитывается в очереди'
+        )
+        email = QueuedEmail.objects.get()
+        assert email.attempts == 1 and email.last_error, (
+            'Проверьте, что неудачная попытка отправки сохраняется'
+        )
+        assert email.send_after > timezone.now(), (
+            'Проверьте, что повторная отправка откладывается'
+        )
+        assert deliver_queued_mail() == (0, 0), (
+            'Проверьте, что письмо не отправляется повторно до истечения задержки'
+        )
+        settings.EMAIL_BACKEND = 'django.core.mail.backends.locmem.EmailBackend'
+        QueuedEmail.objects.update(send_after=timezone.now())
+        assert deliver_queued_mail() == (1, 0) and len(mail.outbox) == 1, (
+            'Проверьте, что письмо отправляется после истечения задержки'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_03_send_outside_transaction(self, settings):
+        for recipient in ('one@yamdb.fake', 'two@yamdb.fake'):
+            QueuedEmail.objects.create(subject='Тема', body='Текст',
+                                       from_email='from@yamdb.fake',
+                                       recipient=recipient)
+        settings.EMAIL_BACKEND = (
+            'tests.test_15_mail_queue.RecordingEmailBackend'
+        )
+        RecordingEmailBackend.calls.clear()
+        assert deliver_queued_mail() == (2, 0)
+        assert RecordingEmailBackend.calls == [(False, (0, 0))] * 2, (
+            'Проверьте, что письма отправляются вне транзакции и не '
+            'забираются повторно другим обработчиком'
+        )
+        assert not QueuedEmail.objects.filter(sent_at=None).exists()
+
+    @pytest.mark.django_db(transaction=True)
+    def test_04_expired_lease(self, settings):
+        email = QueuedEmail.objects.create(subject='Тема', body='Текст',
+                                           from_email='from@yamdb.fake',
+                                           recipient='to@yamdb.fake')
+        # Обработчик забрал письмо и упал, не отправив его.
+        QueuedEmail.objects.filter(pk=email.pk).update(
+            attempts=1,
+            send_after=timezone.now() + timedelta(
+                seconds=settings.EMAIL_QUEUE_LEASE
+            )
+        )
+        assert deliver_queued_mail() == (0, 0), (
+            'Проверьте, что забранное письмо не отправляется до истечения аренды'
+        )
+        QueuedEmail.objects.update(send_after=timezone.now())
+        assert deliver_queued_mail() == (1, 0) and len(mail.outbox) == 1, (
+            'Проверьте, что письмо возвращается в очередь после истечения аренды'
+        )
+        assert QueuedEmail.objects.get().attempts == 2
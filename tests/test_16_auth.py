@@ -0,0 +1,158 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from django.contrib.auth import get_user_model
+from django.contrib.auth.tokens import default_token_generator
+from django.db import connection, transaction
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken
+
+from yamdb.authentication import (AuthenticationWithoutPassword,
+                                  get_user_version, user_cache)
+
+from .common import auth_client
+
+THREADS = 8
+REQUESTS = 40
+
+
+def in_thread(func):
+    def wrapper(*args, **kwargs):
+        try:
+            return func(*args, **kwargs)
+        finally:
+            connection.close()
+    return wrapper
+
+
+class Test16AuthAPI:
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_first_login(self, client):
+        email = 'newuser@yamdb.fake'
+        response = client.post('/api/v1/auth/email/', data={'email': email})
+        assert response.status_code == 200, (
+            'Проверьте, что при POST запросе `/api/v1/auth/email/` без токена '
+            'для нового email возвращается статус 200'
+        )
+        users = get_user_model().objects.filter(email=email)
+        assert users.count() == 1, (
+            'Проверьте, что при POST запросе `/api/v1/auth/email/` создаётся пользователь'
+        )
+        code = default_token_generator.make_token(users.get())
+        response = client.post('/api/v1/auth/token/',
+                               data={'email': email, 'confirmation_code': 'bad'})
+        assert response.status_code == 400, (
+            'Проверьте, что `/api/v1/auth/token/` отклоняет неверный код подтверждения'
+        )
+        response = client.post('/api/v1/auth/token/',
+                               data={'email': email, 'confirmation_code': code})
+        assert response.status_code == 200 and 'access' in response.json(), (
+            'Проверьте, что `/api/v1/auth/token/` выдаёт токен по верному коду подтверждения'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_concurrent_token_requests(self, client, no_throttling):
+        email = 'concurrent@yamdb.fake'
+        client.post('/api/v1/auth/email/', data={'email': email})
+        code = default_token_generator.make_token(
+            get_user_model().objects.get(email=email)
+        )
+
+        @in_thread
+        def request_token(_):
+            return APIClient().post(
+                '/api/v1/auth/token/',
+                data={'email': email, 'confirmation_code': code}
+            ).status_code
+
+        with ThreadPoolExecutor(max_workers=THREADS) as executor:
+            statuses = list(executor.map(request_token, range(REQUESTS)))
+        assert statuses == [200] * REQUESTS, (
+            'Проверьте, что параллельные POST запросы `/api/v1/auth/token/` выполняются без ошибок'
+        )
+        assert get_user_model().objects.filter(email=email).count() == 1, (
+            'Проверьте, что параллельные запросы не создают дубликаты пользователя'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_03_concurrent_first_authenticate(self):
+        email = 'race@yamdb.fake'
+        backend = AuthenticationWithoutPassword()
+
+        @in_thread
+        def authenticate(_):
+            return backend.authenticate(None, email=email, password='').pk
+
+        with ThreadPoolExecutor(max_workers=THREADS) as executor:
+            user_ids = set(executor.map(authenticate, range(REQUESTS)))
+        assert len(user_ids) == 1, (
+            'Проверьте, что параллельный первый вход создаёт одного пользователя'
+        )
+        assert get_user_model().objects.filter(email=email).count() == 1, (
+            'Проверьте, что параллельный первый вход создаёт одного пользователя'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_04_token_claims_and_user_cache(self, client, user_client,
+                                            django_assert_num_queries):
+        email = 'claims@yamdb.fake'
+        client.post('/api/v1/auth/email/', data={'email': email})
+        user = get_user_model().objects.get(email=email)
+        user.username = 'claims'
+        user.save()
+        response = client.post('/api/v1/auth/token/', data={
+            'email': email,
+            'confirmation_code': default_token_generator.make_token(user),
+        })
+        access = response.json()['access']
+        token = AccessToken(access)
+        assert token['role'] == user.role and token['username'] == user.username, (
+            'Проверьте, что токен содержит `role` и `username` пользователя'
+        )
+        user_api = APIClient()
+        user_api.credentials(HTTP_AUTHORIZATION=f'Bearer {access}')
+        assert user_api.get('/api/v1/users/').status_code == 403, (
+            'Проверьте, что обычный пользователь не имеет доступа к `/api/v1/users/`'
+        )
+        with django_assert_num_queries(0):
+            response = user_api.get('/api/v1/users/me/')
+        assert response.json()['email'] == email, (
+            'Проверьте, что пользователь запроса берётся из кэша без обращения к БД'
+        )
+        user_client.patch(f'/api/v1/users/{user.username}/',
+                          data={'role': 'admin'})
+        assert user_api.get('/api/v1/users/').status_code == 200, (
+            'Проверьте, что изменение роли через `/api/v1/users/{username}/` сбрасывает кэш пользователя'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_05_user_cache_other_worker(self, admin, user_client):
+        user = get_user_model().objects.create(username='demoted',
+                                               email='demoted@yamdb.fake',
+                                               role='admin')
+        user_api = auth_client(user)
+        assert user_api.get('/api/v1/users/').status_code == 200
+        version = get_user_version(user.pk)
+        # Запись другого процесса: его локальный кэш не получает удаление.
+        stale = user_cache.get(user.pk, version)
+        assert stale is not None and stale.role == 'admin'
+
+        with transaction.atomic():
+            user_client.patch(f'/api/v1/users/{user.username}/',
+                              data={'role': 'user'})
+            assert get_user_version(user.pk) == version, (
+                'Проверьте, что версия пользователя меняется после фиксации транзакции'
+            )
+        user_cache.set(user.pk, stale, version)
+        assert user_api.get('/api/v1/users/').status_code == 403, (
+            'Проверьте, что изменение роли сбрасывает кэш пользователя во всех процессах'
+        )
+
+        version = get_user_version(user.pk)
+        user_cache.set(user.pk, stale, version)
+        user.is_active = False
+        user.save()
+        assert user_api.get('/api/v1/users/me/').status_code == 401, (
+            'Проверьте, что отключённый пользователь не берётся из кэша'
+        )
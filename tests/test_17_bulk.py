@@ -0,0 +1,182 @@
+import time
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from yamdb.models import Title
+
+from .common import create_categories, create_genre
+
+BENCHMARK_ITEMS = 200
+
+
+def title_payload(genres, categories, count):
+    return [
+        {'name': f'Произведение {i}', 'year': 2000 + i % 20,
+         'genre': [genres[i % len(genres)]['slug'],
+                   genres[(i + 1) % len(genres)]['slug']],
+         'category': categories[i % len(categories)]['slug'],
+         'description': 'Описание'}
+        for i in range(count)
+    ]
+
+
+class Test17BulkAPI:
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_titles_bulk_create(self, client, user_client):
+        genres = create_genre(user_client)
+        categories = create_categories(user_client)
+        url = '/api/v1/titles/bulk/'
+        data = title_payload(genres, categories, 50)
+        response = client.post(url, data=data,
+                               content_type='application/json')
+        assert response.status_code == 401, (
+            f'Проверьте, что POST запрос `{url}` без токена возвращает статус 401'
+        )
+        with CaptureQueriesContext(connection) as context:
+            response = user_client.post(url, data=data, format='json')
+        assert response.status_code == 201, (
+            f'Проверьте, что POST запрос `{url}` с правильными данными возвращает статус 201'
+        )
+        assert len(context.captured_queries) <= 12, (
+            f'Проверьте, что POST запрос `{url}` выполняет постоянное число запросов к БД'
+        )
+        result = response.json()
+        assert len(result) == 50 and all(type(item['id']) == int for item in result), (
+            f'Проверьте, что POST запрос `{url}` возвращает созданные объекты с `id`'
+        )
+        title = Title.objects.get(pk=result[3]['id'])
+        assert title.name == data[3]['name'] and sorted(
+            title.genre.values_list('slug', flat=True)
+        ) == sorted(data[3]['genre']), (
+            f'Проверьте, что POST запрос `{url}` сохраняет жанры произведений'
+        )
+        response = client.get('/api/v1/titles/', {'search': 'произведение'})
+        assert response.json()['count'] == 50, (
+            f'Проверьте, что POST запрос `{url}` добавляет произведения в поисковый индекс'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_titles_bulk_errors_and_update(self, user_client):
+        genres = create_genre(user_client)
+        categories = create_categories(user_client)
+        url = '/api/v1/titles/bulk/'
+        data = title_payload(genres, categories, 3)
+        data[1]['genre'] = ['unknown']
+        del data[2]['name']
+        response = user_client.post(url, data=data, format='json')
+        assert response.status_code == 400, (
+            f'Проверьте, что POST запрос `{url}` с ошибками возвращает статус 400'
+        )
+        errors = response.json()
+        assert errors[0] == {} and 'genre' in errors[1] and 'name' in errors[2], (
+            f'Проверьте, что POST запрос `{url}` возвращает ошибки по каждому объекту'
+        )
+        assert Title.objects.count() == 0, (
+            f'Проверьте, что POST запрос `{url}` с ошибками не создаёт ни одного объекта'
+        )
+        created = user_client.post(
+            url, data=title_payload(genres, categories, 2), format='json'
+        ).json()
+        response = user_client.patch(url, data=[
+            {'id': created[0]['id'], 'name': 'Новое имя'},
+            {'id': created[1]['id'], 'genre': [genres[2]['slug']],
+             'category': None},
+        ], format='json')
+        assert response.status_code == 200, (
+            f'Проверьте, что PATCH запрос `{url}` возвращает статус 200'
+        )
+        first = Title.objects.get(pk=created[0]['id'])
+        second = Title.objects.get(pk=created[1]['id'])
+        assert first.name == 'Новое имя' and first.category is not None, (
+            f'Проверьте, что PATCH запрос `{url}` изменяет только переданные поля'
+        )
+        assert list(second.genre.values_list('slug', flat=True)) == [genres[2]['slug']], (
+            f'Проверьте, что PATCH запрос `{url}` заменяет жанры произведения'
+        )
+        assert second.category is None, (
+            f'Проверьте, что PATCH запрос `{url}` изменяет категорию произведения'
+        )
+        response = user_client.patch(url, data=[{'id': 999999, 'name': 'x'}],
+                                     format='json')
+        assert response.status_code == 400 and 'id' in response.json()[0], (
+            f'Проверьте, что PATCH запрос `{url}` с несуществующим `id` возвращает ошибку'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_03_genres_categories_bulk(self, client, user_client):
+        create_genre(user_client)
+        client.get('/api/v1/genres/')
+        url = '/api/v1/genres/bulk/'
+        response = user_client.post(url, data=[
+            {'name': 'Фэнтези', 'slug': 'fantasy'},
+            {'name': 'Ужасы 2', 'slug': 'horror'},
+        ], format='json')
+        assert response.status_code == 400 and 'slug' in response.json()[1], (
+            f'Проверьте, что POST запрос `{url}` не создаёт объекты с занятым slug'
+        )
+        response = user_client.post(url, data=[
+            {'name': 'Фэнтези', 'slug': 'fantasy'},
+            {'name': 'Вестерн', 'slug': 'western'},
+        ], format='json')
+        assert response.status_code == 201, (
+            f'Проверьте, что POST запрос `{url}` возвращает статус 201'
+        )
+        assert client.get('/api/v1/genres/').json()['count'] == 5, (
+            f'Проверьте, что POST запрос `{url}` сбрасывает кэш списка жанров'
+        )
+        url = '/api/v1/categories/bulk/'
+        create_categories(user_client)
+        response = user_client.patch(url, data=[
+            {'name': 'Кино', 'slug': 'films'},
+        ], format='json')
+        assert response.status_code == 200, (
+            f'Проверьте, что PATCH запрос `{url}` возвращает статус 200'
+        )
+        names = [item['name'] for item in
+                 client.get('/api/v1/categories/').json()['results']]
+        assert 'Кино' in names, (
+            f'Проверьте, что PATCH запрос `{url}` изменяет название категории'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_04_titles_bulk_benchmark(self, user_client):
+        genres = create_genre(user_client)
+        categories = create_categories(user_client)
+        data = title_payload(genres, categories, BENCHMARK_ITEMS)
+
+        start = time.perf_counter()
+        for item in data:
+            user_client.post('/api/v1/titles/', data=item)
+        single = BENCHMARK_ITEMS / (time.perf_counter() - start)
+
+        start = time.perf_counter()
+        user_client.post('/api/v1/titles/bulk/', data=data, format='json')
+        bulk = BENCHMARK_ITEMS / (time.perf_counter() - start)
+
+        print(f'\nПроизведений в секунду: по одному {single:.0f}, '
+              f'пакетом {bulk:.0f}')
+        assert Title.objects.count() == 2 * BENCHMARK_ITEMS, (
+            'Проверьте, что все произведения созданы'
+        )
+        assert bulk > single, (
+            'Проверьте, что пакетное создание произведений быстрее поштучного'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_05_reserved_bulk_slug(self, user_client):
+        for url in ('/api/v1/categories/', '/api/v1/genres/'):
+            response = user_client.post(url, data={'name': 'Массовые',
+                                                   'slug': 'bulk'})
+            assert response.status_code == 400 and 'slug' in response.json(), (
+                f'Проверьте, что POST запрос `{url}` не создаёт объект со slug `bulk`, '
+                f'который перекрывается путём `{url}bulk/`'
+            )
+            response = user_client.post(f'{url}bulk/', data=[
+                {'name': 'Массовые', 'slug': 'bulk'},
+            ], format='json')
+            assert response.status_code == 400 and 'slug' in response.json()[0], (
+                f'Проверьте, что POST запрос `{url}bulk/` не создаёт объект со slug `bulk`'
+            )
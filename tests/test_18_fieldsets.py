@@ -0,0 +1,62 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from .common import create_comments
+
+
+class Test18FieldsetsAPI:
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_titles_fields(self, client, user_client, admin):
+        _, _, titles, _, _ = create_comments(user_client, admin)
+        url = '/api/v1/titles/'
+        with CaptureQueriesContext(connection) as context:
+            response = client.get(url, {'fields': 'id,name,rating'})
+        results = response.json()['results']
+        assert all(set(title) == {'id', 'name', 'rating'} for title in results), (
+            f'Проверьте, что `{url}?fields=` возвращает только указанные поля'
+        )
+        assert len(context.captured_queries) == 2, (
+            f'Проверьте, что `{url}?fields=` не загружает жанры и категории, если они не запрошены'
+        )
+        assert not any('description' in query['sql']
+                       for query in context.captured_queries), (
+            f'Проверьте, что `{url}?fields=` не выбирает из БД незапрошенные колонки'
+        )
+        assert any(title['rating'] is not None for title in results), (
+            f'Проверьте, что `{url}?fields=rating` возвращает рейтинг'
+        )
+        response = client.get(f'{url}{titles[0]["id"]}/',
+                              {'exclude': 'description,genre'})
+        assert set(response.json()) == {'id', 'name', 'year', 'rating',
+                                        'category'}, (
+            f'Проверьте, что `{url}{{title_id}}/?exclude=` исключает указанные поля'
+        )
+        assert response.json()['category']['slug'], (
+            f'Проверьте, что `{url}{{title_id}}/?exclude=` возвращает категорию, если она не исключена'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_reviews_comments_fields(self, client, user_client, admin):
+        comments, reviews, titles, _, _ = create_comments(user_client, admin)
+        url = f'/api/v1/titles/{titles[0]["id"]}/reviews/'
+        response = client.get(url, {'fields': 'id,score'})
+        assert response.json()['results'] and all(
+            set(review) == {'id', 'score'}
+            for review in response.json()['results']
+        ), (
+            f'Проверьте, что `{url}?fields=` возвращает только указанные поля'
+        )
+        response = client.get(url, {'fields': 'id', 'cursor': ''})
+        assert response.status_code == 200, (
+            f'Проверьте, что `{url}?fields=` работает вместе с `cursor`'
+        )
+        url = f'{url}{reviews[0]["id"]}/comments/'
+        response = client.get(url, {'exclude': 'text'})
+        assert len(response.json()['results']) == len(comments) and all(
+            'text' not in comment and comment['author']
+            for comment in response.json()['results']
+        ), (
+            f'Проверьте, что `{url}?exclude=` исключает указанные поля'
+        )
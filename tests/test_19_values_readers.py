@@ -0,0 +1,95 @@
+import time
+
+import pytest
+
+from yamdb.models import Category, Genre, Title
+from yamdb.readers import TitleValuesReader
+from yamdb.serializers import TitleReadSerializer
+from yamdb.views import CommentsViewSet, ReviewViewSet, TitlesViewSet
+
+from .common import create_comments
+
+BENCHMARK_TITLES = 300
+BENCHMARK_REPEAT = 5
+
+
+def serializer_response(monkeypatch, viewset, client, url, params):
+    with monkeypatch.context() as patch:
+        patch.setattr(viewset, 'values_reader_class', None)
+        return client.get(url, params).json()
+
+
+class Test19ValuesReaders:
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_identical_output(self, client, user_client, admin, monkeypatch):
+        comments, reviews, titles, _, _ = create_comments(user_client, admin)
+        user_client.post('/api/v1/titles/', data={
+            'name': 'Без категории', 'year': 1999, 'description': 'Пусто'
+        })
+        cases = [
+            (TitlesViewSet, '/api/v1/titles/', {}),
+            (TitlesViewSet, '/api/v1/titles/', {'fields': 'id,genre,rating'}),
+            (TitlesViewSet, '/api/v1/titles/', {'search': 'поворот'}),
+            (ReviewViewSet, f'/api/v1/titles/{titles[0]["id"]}/reviews/', {}),
+            (ReviewViewSet, f'/api/v1/titles/{titles[0]["id"]}/reviews/',
+             {'cursor': '', 'exclude': 'text'}),
+            (CommentsViewSet, f'/api/v1/titles/{titles[0]["id"]}/reviews/'
+                              f'{reviews[0]["id"]}/comments/', {}),
+        ]
+        for viewset, url, params in cases:
+            expected = serializer_response(monkeypatch, viewset, client,
+                                           url, params)
+            response = client.get(url, params).json()
+            assert response == expected, (
+                f'Проверьте, что быстрый ответ `{url}` с параметрами {params} '
+                'совпадает с ответом сериализатора'
+            )
+            assert [list(item) for item in response['results']] == [
+                list(item) for item in expected['results']
+            ], (
+                f'Проверьте, что быстрый ответ `{url}` сохраняет порядок полей'
+            )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_microbenchmark(self):
+        category = Category.objects.create(name='Фильм', slug='films')
+        Genre.objects.bulk_create(
+            Genre(name=f'Жанр {i}', slug=f'genre-{i}') for i in range(5)
+        )
+        genres = list(Genre.objects.all())
+        Title.objects.bulk_create(
+            Title(name=f'Произведение {i}', year=2000, category=category,
+                  description='Описание', rating_sum=i, rating_count=1)
+            for i in range(BENCHMARK_TITLES)
+        )
+        through = Title.genre.through
+        through.objects.bulk_create(
+            through(title_id=title_id, genre_id=genre.pk)
+            for title_id in Title.objects.values_list('id', flat=True)
+            for genre in genres[:2]
+        )
+        queryset = TitlesViewSet.queryset.all()
+        reader = TitleValuesReader(None)
+
+        def measure(func):
+            best = None
+            for _ in range(BENCHMARK_REPEAT):
+                start = time.perf_counter()
+                func()
+                elapsed = time.perf_counter() - start
+                best = elapsed if best is None else min(best, elapsed)
+            return best
+
+        serializer_time = measure(
+            lambda: TitleReadSerializer(queryset.all(), many=True).data
+        )
+        reader_time = measure(
+            lambda: reader.to_representation(reader.get_queryset(queryset))
+        )
+        print(f'\n{BENCHMARK_TITLES} произведений: сериализатор '
+              f'{serializer_time * 1000:.1f} мс, values() '
+              f'{reader_time * 1000:.1f} мс')
+        assert reader_time < serializer_time, (
+            'Проверьте, что чтение через values() быстрее сериализатора'
+        )
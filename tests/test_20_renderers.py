@@ -0,0 +1,94 @@
+import datetime
+import decimal
+import json
+
+import pytest
+from rest_framework.renderers import JSONRenderer
+
+from yamdb import renderers
+from yamdb.renderers import FastJSONRenderer
+from yamdb.views import TitlesViewSet
+
+from .common import create_comments
+
+DATA = {
+    'name': 'Произведение с разделителем',
+    'date': datetime.datetime(2021, 3, 1, 12, 30,
+                              tzinfo=datetime.timezone.utc),
+    'price': decimal.Decimal('1.50'),
+    'items': [1, 2.5, None, True],
+}
+
+
+def stream_content(response):
+    assert response.streaming, 'Проверьте, что ответ отдаётся потоком'
+    return json.loads(b''.join(response.streaming_content))
+
+
+class Test20Renderers:
+
+    def test_01_fast_renderer_matches_json_renderer(self, monkeypatch):
+        expected = JSONRenderer().render(DATA)
+        assert FastJSONRenderer().render(DATA) == expected, (
+            'Проверьте, что FastJSONRenderer отдаёт тот же JSON, '
+            'что и JSONRenderer'
+        )
+        assert FastJSONRenderer().render(DATA, 'application/json; indent=4') \
+            == JSONRenderer().render(DATA, 'application/json; indent=4'), (
+            'Проверьте, что FastJSONRenderer поддерживает отступы'
+        )
+        monkeypatch.setattr(renderers, 'orjson', None)
+        assert FastJSONRenderer().render(DATA) == expected, (
+            'Проверьте, что без orjson FastJSONRenderer использует '
+            'стандартный json'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_stream_matches_regular_response(self, client, user_client,
+                                                admin, monkeypatch):
+        _, reviews, titles, _, _ = create_comments(user_client, admin)
+        monkeypatch.setattr(TitlesViewSet, 'stream_chunk_size', 1)
+        urls = [
+            ('/api/v1/titles/', {}),
+            ('/api/v1/titles/', {'fields': 'id,genre', 'page_size': 1}),
+            ('/api/v1/titles/', {'name': 'нет такого'}),
+            (f'/api/v1/titles/{titles[0]["id"]}/reviews/', {'cursor': ''}),
+            (f'/api/v1/titles/{titles[0]["id"]}/reviews/'
+             f'{reviews[0]["id"]}/comments/', {}),
+        ]
+        for url, params in urls:
+            expected = client.get(url, params).json()
+            response = client.get(url, {**params, 'stream': '1'})
+            assert response.status_code == 200, (
+                f'Проверьте, что `{url}?stream=1` возвращает статус 200'
+            )
+            assert response['Content-Type'] == 'application/json'
+            content = stream_content(response)
+            for link in ('next', 'previous'):
+                if expected.get(link):
+                    assert content[link] == f'{expected[link]}&stream=1'
+                    content[link] = expected[link]
+            assert content == expected, (
+                f'Проверьте, что потоковый ответ `{url}` совпадает с обычным'
+            )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_03_stream_without_pagination(self, client, user_client, admin,
+                                          monkeypatch):
+        create_comments(user_client, admin)
+        monkeypatch.setattr(TitlesViewSet, 'pagination_class', None)
+        expected = client.get('/api/v1/titles/').json()
+        assert isinstance(expected, list)
+        response = client.get('/api/v1/titles/', {'stream': 'true'})
+        assert stream_content(response) == expected, (
+            'Проверьте потоковый ответ без пагинации'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_04_stream_only_for_json(self, client, user_client, admin):
+        create_comments(user_client, admin)
+        response = client.get('/api/v1/titles/',
+                              {'stream': '1', 'format': 'api'})
+        assert not response.streaming, (
+            'Проверьте, что поток отдаётся только для JSON'
+        )
@@ -0,0 +1,105 @@
+import pytest
+from rest_framework.test import APIClient
+
+from yamdb.throttling import SlidingWindowRateThrottle
+
+from .common import create_titles
+
+
+class Clock:
+
+    def __init__(self, now):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def rates(monkeypatch):
+    def set_rates(**scopes):
+        monkeypatch.setattr(SlidingWindowRateThrottle, 'THROTTLE_RATES', {
+            **SlidingWindowRateThrottle.THROTTLE_RATES, **scopes
+        })
+    return set_rates
+
+
+class Test21ThrottlingAPI:
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_auth_email(self, client):
+        url = '/api/v1/auth/email/'
+        statuses = [
+            client.post(url, data={'email': f'user{i}@yamdb.fake'}).status_code
+            for i in range(6)
+        ]
+        assert statuses == [200] * 5 + [429], (
+            f'Проверьте, что POST запросы `{url}` ограничены 5 в минуту'
+        )
+        response = client.post(url, data={'email': 'user@yamdb.fake'})
+        assert int(response['Retry-After']) > 0, (
+            f'Проверьте, что ответ 429 на `{url}` содержит заголовок Retry-After'
+        )
+        response = client.post(url, data={'email': 'user@yamdb.fake'},
+                               REMOTE_ADDR='10.0.0.2')
+        assert response.status_code == 200, (
+            f'Проверьте, что POST запросы `{url}` ограничиваются по клиенту'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_sliding_window(self, client, monkeypatch):
+        clock = Clock(6000.0)
+        monkeypatch.setattr(SlidingWindowRateThrottle, 'timer', clock)
+        url = '/api/v1/auth/email/'
+
+        def post():
+            return client.post(url, data={'email': 'user@yamdb.fake'})
+
+        assert [post().status_code for _ in range(5)] == [200] * 5
+        clock.now = 6060.0
+        response = post()
+        assert response.status_code == 429, (
+            'Проверьте, что запросы предыдущего окна учитываются в начале '
+            'следующего окна'
+        )
+        assert int(response['Retry-After']) == 12
+        clock.now = 6090.0
+        assert [post().status_code for _ in range(3)] == [200, 200, 429], (
+            'Проверьте, что вклад предыдущего окна убывает со временем'
+        )
+        clock.now = 6180.0
+        assert [post().status_code for _ in range(5)] == [200] * 5
+
+    @pytest.mark.django_db(transaction=True)
+    def test_03_content_create(self, user_client, rates):
+        rates(content_create='2/min')
+        titles, _, _ = create_titles(user_client)
+        url = f'/api/v1/titles/{titles[0]["id"]}/reviews/'
+        statuses = [
+            user_client.post(url, data={'text': 'Отзыв', 'score': 5}).status_code
+            for _ in range(2)
+        ]
+        assert statuses == [201, 400]
+        response = user_client.post(url, data={'text': 'Отзыв', 'score': 5})
+        assert response.status_code == 429, (
+            f'Проверьте, что POST запросы `{url}` ограничены'
+        )
+        assert user_client.get(url).status_code == 200, (
+            f'Проверьте, что GET запросы `{url}` не ограничены'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_04_admin_write(self, user_client, rates):
+        rates(admin_write='2/min')
+        url = '/api/v1/categories/'
+        statuses = [
+            user_client.post(url, data={'name': f'Категория {i}',
+                                        'slug': f'category-{i}'}).status_code
+            for i in range(3)
+        ]
+        assert statuses == [201, 201, 429], (
+            f'Проверьте, что POST запросы администратора к `{url}` ограничены'
+        )
+        assert APIClient().get(url).status_code == 200, (
+            f'Проверьте, что GET запросы `{url}` не ограничены'
+        )
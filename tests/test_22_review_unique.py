@@ -0,0 +1,81 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken
+
+from yamdb.models import Review, Title
+
+from .common import create_titles
+
+THREADS = 8
+REQUESTS = 16
+ATTEMPTS = 20
+
+
+class Test22ReviewUniqueAPI:
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_duplicate_review(self, user_client):
+        titles, _, _ = create_titles(user_client)
+        url = f'/api/v1/titles/{titles[0]["id"]}/reviews/'
+        with CaptureQueriesContext(connection) as context:
+            response = user_client.post(url, data={'text': 'Отзыв', 'score': 5})
+        assert response.status_code == 201
+        assert not any('LIMIT 1' in query['sql'] and 'yamdb_review' in query['sql']
+                       for query in context.captured_queries), (
+            f'Проверьте, что POST запрос `{url}` не проверяет дубликат отдельным запросом'
+        )
+        response = user_client.post(url, data={'text': 'Ещё', 'score': 1})
+        assert response.status_code == 400, (
+            f'Проверьте, что повторный POST запрос `{url}` возвращает статус 400'
+        )
+        assert response.json() == {
+            'non_field_errors': ['Отзыв уже был оставлен.']
+        }, (
+            f'Проверьте текст ошибки при повторном POST запросе `{url}`'
+        )
+        title = Title.objects.get(pk=titles[0]['id'])
+        assert (title.rating_sum, title.rating_count) == (5, 1), (
+            'Проверьте, что отклонённый отзыв не меняет рейтинг'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_concurrent_reviews(self, user_client, admin, no_throttling):
+        titles, _, _ = create_titles(user_client)
+        url = f'/api/v1/titles/{titles[0]["id"]}/reviews/'
+
+        token = AccessToken.for_user(admin)
+
+        def post_review(score):
+            # SQLite может сразу отказать конкурирующей записи
+            # (database is locked, статус 500) — повторяем, как клиент.
+            client = APIClient(raise_request_exception=False)
+            client.credentials(HTTP_AUTHORIZATION=f'Bearer {token}')
+            try:
+                for _ in range(ATTEMPTS):
+                    status_code = client.post(
+                        url, data={'text': 'Отзыв', 'score': score}
+                    ).status_code
+                    if status_code != 500:
+                        return status_code
+                return status_code
+            finally:
+                connection.close()
+
+        with ThreadPoolExecutor(max_workers=THREADS) as executor:
+            statuses = list(executor.map(
+                post_review, [i % 10 + 1 for i in range(REQUESTS)]
+            ))
+        assert sorted(statuses) == [201] + [400] * (REQUESTS - 1), (
+            f'Проверьте, что параллельные POST запросы `{url}` создают один отзыв, '
+            f'получено {statuses}'
+        )
+        assert Review.objects.filter(author=admin).count() == 1
+        review = Review.objects.get(author=admin)
+        title = Title.objects.get(pk=titles[0]['id'])
+        assert (title.rating_sum, title.rating_count) == (review.score, 1), (
+            'Проверьте, что параллельные отзывы не искажают рейтинг'
+        )
@@ -0,0 +1,65 @@
+import pytest
+from django.core.management import call_command
+
+from yamdb.models import Review, Title, TitleScore
+
+from .common import auth_client, create_reviews
+
+
+def expected_stats(title_id):
+    scores = list(Review.objects.filter(title_id=title_id)
+                  .values_list('score', flat=True))
+    return {
+        'count': len(scores),
+        'mean': sum(scores) / len(scores) if scores else None,
+        'scores': [{'score': score, 'count': scores.count(score)}
+                   for score in range(1, 11)],
+    }
+
+
+class Test23TitleStatsAPI:
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_stats(self, client, user_client, admin,
+                      django_assert_num_queries):
+        reviews, titles, user, _ = create_reviews(user_client, admin)
+        title_id = titles[0]['id']
+        url = f'/api/v1/titles/{title_id}/stats/'
+        with django_assert_num_queries(2):
+            response = client.get(url)
+        assert response.status_code == 200, (
+            f'Проверьте, что при GET запросе `{url}` возвращается статус 200'
+        )
+        assert response.json() == expected_stats(title_id), (
+            f'Проверьте, что `{url}` возвращает распределение, число и среднее оценок'
+        )
+        assert response.json()['mean'] == 4.0
+
+        reviews_url = f'/api/v1/titles/{title_id}/reviews/'
+        auth_client(user).patch(f'{reviews_url}{reviews[1]["id"]}/',
+                                data={'score': 10})
+        user_client.delete(f'{reviews_url}{reviews[0]["id"]}/')
+        data = client.get(url).json()
+        assert data == expected_stats(title_id), (
+            f'Проверьте, что `{url}` учитывает изменение и удаление отзывов'
+        )
+        assert data['count'] == 2 and data['mean'] == 7.0
+
+        empty = client.get(f'/api/v1/titles/{titles[1]["id"]}/stats/').json()
+        assert empty['count'] == 0 and empty['mean'] is None
+        assert client.get('/api/v1/titles/100500/stats/').status_code == 404, (
+            'Проверьте, что для несуществующего произведения `stats` возвращает 404'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_rebuild(self, client, user_client, admin):
+        _, titles, _, _ = create_reviews(user_client, admin)
+        title_id = titles[0]['id']
+        TitleScore.objects.all().delete()
+        Title.objects.update(rating_sum=0, rating_count=0)
+        call_command('rebuild_ratings')
+        assert client.get(f'/api/v1/titles/{title_id}/stats/').json() == (
+            expected_stats(title_id)
+        ), (
+            'Проверьте, что команда rebuild_ratings пересчитывает распределение оценок'
+        )
@@ -0,0 +1,132 @@
+import pytest
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+
+from yamdb.models import Category, Genre, Review, Title
+
+# (категория, жанры, оценки)
+TITLES = [
+    ('films', ['drama'], [10]),
+    ('films', ['drama', 'comedy'], [9, 9, 8, 9, 9, 8, 9, 9, 8, 9, 9, 8]),
+    ('books', ['comedy'], [7, 6, 7, 6]),
+    ('books', ['drama'], [2, 3, 1]),
+    (None, ['comedy'], [5, 5]),
+    ('films', [], []),
+]
+
+
+def seed(min_reviews, settings):
+    settings.TOP_TITLES_MIN_REVIEWS = min_reviews
+    categories = {slug: Category.objects.create(name=slug, slug=slug)
+                  for slug in ('films', 'books')}
+    genres = {slug: Genre.objects.create(name=slug, slug=slug)
+              for slug in ('drama', 'comedy')}
+    get_user_model().objects.bulk_create(
+        get_user_model()(username=f'user{i}', email=f'user{i}@yamdb.fake')
+        for i in range(12)
+    )
+    users = list(get_user_model().objects.all())
+    titles = []
+    for i, (category, title_genres, scores) in enumerate(TITLES):
+        title = Title.objects.create(
+            name=f'Произведение {i}', year=2000, description='Описание',
+            category=categories.get(category)
+        )
+        title.genre.set([genres[slug] for slug in title_genres])
+        Review.objects.bulk_create(
+            Review(title=title, author=user, text='Отзыв', score=score)
+            for user, score in zip(users, scores)
+        )
+        titles.append(title)
+    Title.rebuild_ratings()
+    return titles
+
+
+def expected_top(titles, min_reviews, category=None, genre=None):
+    scores = [score for _, _, title_scores in TITLES
+              for score in title_scores]
+    mean = sum(scores) / len(scores)
+    result = []
+    for title, (title_category, title_genres, title_scores) in zip(
+            titles, TITLES):
+        if not title_scores:
+            continue
+        if category and title_category != category:
+            continue
+        if genre and genre not in title_genres:
+            continue
+        weighted = ((sum(title_scores) + min_reviews * mean)
+                    / (len(title_scores) + min_reviews))
+        result.append((-weighted, -title.pk))
+    return [-pk for _, pk in sorted(result)]
+
+
+class Test24TopTitlesAPI:
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_ordering(self, client, settings):
+        titles = seed(10, settings)
+        ratings = {title.pk: (title.rating_sum / title.rating_count
+                              if title.rating_count else None,
+                              title.rating_count)
+                   for title in Title.objects.all()}
+        by_rating = sorted((pk for pk in ratings if ratings[pk][0]),
+                           key=lambda pk: (-ratings[pk][0], -pk))
+        response = client.get('/api/v1/titles/', {'ordering': '-rating'})
+        assert response.status_code == 200
+        ids = [title['id'] for title in response.json()['results']]
+        assert ids == by_rating + [titles[-1].pk], (
+            'Проверьте, что `ordering=-rating` сортирует произведения по рейтингу, '
+            'произведения без оценок — в конце'
+        )
+        response = client.get('/api/v1/titles/', {'ordering': 'rating'})
+        ids = [title['id'] for title in response.json()['results']]
+        assert ids[:-1] == sorted(by_rating,
+                                  key=lambda pk: (ratings[pk][0], -pk))
+        response = client.get('/api/v1/titles/',
+                              {'ordering': '-review_count', 'fields': 'id'})
+        ids = [title['id'] for title in response.json()['results']]
+        assert ids == sorted(ratings, key=lambda pk: (-ratings[pk][1], -pk)), (
+            'Проверьте, что `ordering=-review_count` сортирует по числу отзывов'
+        )
+        response = client.get('/api/v1/titles/', {'ordering': 'name'})
+        assert response.status_code == 400
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_top(self, client, settings, django_assert_num_queries):
+        titles = seed(5, settings)
+        call_command('refresh_top_titles')
+        url = '/api/v1/titles/top/'
+        with django_assert_num_queries(3):
+            response = client.get(url)
+        assert response.status_code == 200, (
+            f'Проверьте, что при GET запросе `{url}` возвращается статус 200'
+        )
+        data = response.json()
+        assert [item['id'] for item in data] == expected_top(titles, 5), (
+            f'Проверьте, что `{url}` упорядочивает произведения по '
+            'байесовскому рейтингу'
+        )
+        assert data[0]['id'] == titles[1].pk, (
+            'Проверьте, что одна высокая оценка не выводит произведение на первое место'
+        )
+        assert set(data[0]) == {'id', 'name', 'year', 'genre', 'rating',
+                                'category', 'description', 'weighted_rating'}
+        cases = [
+            ({'category': 'books'}, {'category': 'books'}),
+            ({'genre': 'comedy'}, {'genre': 'comedy'}),
+        ]
+        for params, scope in cases:
+            data = client.get(url, params).json()
+            assert [item['id'] for item in data] == expected_top(
+                titles, 5, **scope
+            ), (
+                f'Проверьте, что `{url}` с параметрами {params} возвращает '
+                'рейтинг внутри категории или жанра'
+            )
+        data = client.get(url, {'limit': 2, 'fields': 'id'}).json()
+        assert [set(item) for item in data] == [{'id', 'weighted_rating'}] * 2
+        assert client.get(url, {'category': 'unknown'}).json() == []
+        assert client.get(url, {'category': 'books',
+                                'genre': 'drama'}).status_code == 400
+        assert client.get(url, {'limit': 'many'}).status_code == 400
@@ -0,0 +1,132 @@
+import time
+from datetime import datetime, timezone
+
+import pytest
+from django.core.cache import cache
+from django.utils.http import http_date
+
+from yamdb.caching import MODIFIED_KEY
+from yamdb.models import Title
+
+from .common import auth_client, create_comments
+
+NAMESPACES = ('titles', 'categories', 'genres', 'users')
+
+
+def assert_not_modified(client, url, django_assert_num_queries, **headers):
+    # Для отзывов и комментариев читается только версия произведения.
+    with django_assert_num_queries(0 if '/reviews/' not in url else 1):
+        response = client.get(url, **headers)
+    assert response.status_code == 304, (
+        f'Проверьте, что GET запрос `{url}` с актуальным условием '
+        'возвращает 304 без основного запроса к БД'
+    )
+
+
+class Test25ConditionalGetAPI:
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_etag(self, client, user_client, admin,
+                     django_assert_num_queries):
+        comments, reviews, titles, user, _ = create_comments(user_client,
+                                                             admin)
+        title_url = f'/api/v1/titles/{titles[0]["id"]}/'
+        review_url = f'{title_url}reviews/{reviews[0]["id"]}/'
+        urls = [
+            '/api/v1/titles/',
+            title_url,
+            f'{title_url}reviews/',
+            review_url,
+            f'{review_url}comments/',
+            f'{review_url}comments/{comments[0]["id"]}/',
+        ]
+        etags = {}
+        for url in urls:
+            response = client.get(url)
+            assert response.status_code == 200
+            etags[url] = response['ETag']
+            assert etags[url], (
+                f'Проверьте, что GET запрос `{url}` возвращает заголовок ETag'
+            )
+            assert_not_modified(client, url, django_assert_num_queries,
+                                HTTP_IF_NONE_MATCH=etags[url])
+        assert client.get('/api/v1/titles/', {'fields': 'id'})['ETag'] != (
+            etags['/api/v1/titles/']
+        ), 'Проверьте, что ETag зависит от параметров запроса'
+
+        # Отзыв к другому произведению меняет рейтинг в списке
+        # произведений, но не отзывы и комментарии первого.
+        auth_client(user).post(f'/api/v1/titles/{titles[1]["id"]}/reviews/',
+                               data={'text': 'Отзыв', 'score': 1})
+        changed = [url for url in urls
+                   if client.get(url, HTTP_IF_NONE_MATCH=etags[url])
+                   .status_code == 200]
+        assert changed == urls[:2], (
+            'Проверьте, что отзыв к другому произведению сбрасывает только '
+            f'ETag произведений, сброшены: {changed}'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_changes_outside_api(self, client, user_client, admin):
+        _, _, titles, _, _ = create_comments(user_client, admin)
+        etag = client.get('/api/v1/titles/')['ETag']
+        title = Title.objects.get(pk=titles[0]['id'])
+        title.genre.clear()
+        response = client.get('/api/v1/titles/', HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == 200, (
+            'Проверьте, что изменение жанров произведения сбрасывает ETag'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_03_last_modified(self, client, user_client, admin,
+                              django_assert_num_queries):
+        _, reviews, titles, _, _ = create_comments(user_client, admin)
+        url = f'/api/v1/titles/{titles[0]["id"]}/reviews/'
+        response = client.get(url)
+        assert not response.has_header('Last-Modified'), (
+            'Проверьте, что Last-Modified не отдаётся, пока не закончилась '
+            'секунда изменения'
+        )
+        modified = time.time() - 10
+        cache.set_many({MODIFIED_KEY.format(namespace): modified
+                        for namespace in NAMESPACES}, None)
+        Title.objects.update(
+            modified=datetime.fromtimestamp(modified, timezone.utc)
+        )
+        response = client.get(url)
+        assert response['Last-Modified'] == http_date(modified), (
+            f'Проверьте, что GET запрос `{url}` возвращает Last-Modified'
+        )
+        assert_not_modified(client, url, django_assert_num_queries,
+                            HTTP_IF_MODIFIED_SINCE=response['Last-Modified'])
+        response = client.get(url, HTTP_IF_MODIFIED_SINCE=http_date(modified - 60))
+        assert response.status_code == 200
+        response = client.get(url, HTTP_IF_MODIFIED_SINCE=http_date(modified),
+                              HTTP_IF_NONE_MATCH='"other"')
+        assert response.status_code == 200, (
+            'Проверьте, что If-None-Match важнее If-Modified-Since'
+        )
+        user_client.patch(f'{url}{reviews[0]["id"]}/', data={'score': 1})
+        response = client.get(url, HTTP_IF_MODIFIED_SINCE=http_date(modified))
+        assert response.status_code == 200, (
+            'Проверьте, что после изменения отзыва If-Modified-Since не возвращает 304'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_04_users_namespace(self, client, user_client, admin):
+        _, reviews, titles, user, _ = create_comments(user_client, admin)
+        url = (f'/api/v1/titles/{titles[0]["id"]}/reviews/'
+               f'{reviews[0]["id"]}/comments/')
+        etag = client.get(url)['ETag']
+        client.post('/api/v1/auth/email/', data={'email': 'new@yamdb.fake'})
+        user_client.patch(f'/api/v1/users/{user.username}/',
+                          data={'bio': 'Новое описание'})
+        assert client.get(url, HTTP_IF_NONE_MATCH=etag).status_code == 304, (
+            'Проверьте, что регистрация и изменение полей, кроме username, '
+            'не сбрасывают ETag отзывов и комментариев'
+        )
+        user_client.patch(f'/api/v1/users/{user.username}/',
+                          data={'username': 'renamed'})
+        assert client.get(url, HTTP_IF_NONE_MATCH=etag).status_code == 200, (
+            'Проверьте, что изменение username сбрасывает ETag комментариев'
+        )
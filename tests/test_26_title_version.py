@@ -0,0 +1,158 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from django.db import connection
+from django.test import Client
+
+from yamdb.models import Review, Title
+
+from .common import auth_client, create_comments
+
+THREADS = 8
+BUMPS = 40
+
+
+def version(title_id):
+    return Title.get_version(title_id)[0]
+
+
+class Test26TitleVersion:
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_api_writes(self, user_client, admin):
+        comments, reviews, titles, user, _ = create_comments(user_client,
+                                                             admin)
+        title_id, other_id = titles[0]['id'], titles[1]['id']
+        reviews_url = f'/api/v1/titles/{title_id}/reviews/'
+        comments_url = f'{reviews_url}{reviews[0]["id"]}/comments/'
+        other_version = version(other_id)
+        writes = [
+            lambda: user_client.patch(f'{reviews_url}{reviews[0]["id"]}/',
+                                      data={'text': 'Новый текст'}),
+            lambda: user_client.delete(f'{reviews_url}{reviews[2]["id"]}/'),
+            lambda: user_client.post(comments_url, data={'text': 'Ещё'}),
+            lambda: user_client.patch(f'{comments_url}{comments[0]["id"]}/',
+                                      data={'text': 'Правка'}),
+            lambda: user_client.delete(f'{comments_url}{comments[1]["id"]}/'),
+        ]
+        current = version(title_id)
+        assert Title.get_version(title_id)[1] is not None
+        for write in writes:
+            response = write()
+            assert response.status_code < 300
+            assert version(title_id) == current + 1, (
+                'Проверьте, что каждое изменение отзывов и комментариев '
+                'увеличивает версию произведения на 1'
+            )
+            current += 1
+        assert version(other_id) == other_version
+        auth_client(user).post(f'/api/v1/titles/{other_id}/reviews/',
+                               data={'text': 'Отзыв', 'score': 3})
+        assert version(other_id) == other_version + 1
+        assert version(title_id) == current
+        assert Title.get_version(100500) is None
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_admin_writes(self, client, user_client, admin):
+        comments, reviews, titles, _, _ = create_comments(user_client, admin)
+        title_id = titles[0]['id']
+        admin_client = Client()
+        admin_client.force_login(admin)
+        comments_url = (f'/api/v1/titles/{title_id}/reviews/'
+                        f'{reviews[0]["id"]}/comments/')
+        etag = client.get(comments_url)['ETag']
+
+        current = version(title_id)
+        review = Review.objects.get(pk=reviews[0]['id'])
+        response = admin_client.post(
+            f'/admin/yamdb/review/{review.pk}/change/',
+            data={'title': title_id, 'text': review.text,
+                  'author': review.author_id, 'score': 1}
+        )
+        assert response.status_code == 302, response.content
+        title = Title.objects.get(pk=title_id)
+        assert title.version == current + 1, (
+            'Проверьте, что изменение отзыва в админке увеличивает версию произведения'
+        )
+        assert (title.rating_sum, title.rating_count) == (1 + 3 + 4, 3), (
+            'Проверьте, что изменение отзыва в админке пересчитывает рейтинг'
+        )
+        assert client.get(comments_url, HTTP_IF_NONE_MATCH=etag).status_code == 200, (
+            'Проверьте, что изменение в админке сбрасывает ETag комментариев'
+        )
+
+        current = version(title_id)
+        response = admin_client.post(
+            f'/admin/yamdb/comment/{comments[0]["id"]}/delete/',
+            data={'post': 'yes'}
+        )
+        assert response.status_code == 302
+        assert version(title_id) == current + 1, (
+            'Проверьте, что удаление комментария в админке увеличивает версию произведения'
+        )
+
+        response = admin_client.post('/admin/yamdb/review/', data={
+            'action': 'delete_selected', 'post': 'yes',
+            '_selected_action': [item['id'] for item in reviews[1:]],
+        })
+        assert response.status_code == 302
+        title = Title.objects.get(pk=title_id)
+        assert (title.rating_sum, title.rating_count) == (1, 1), (
+            'Проверьте, что массовое удаление отзывов в админке пересчитывает рейтинг'
+        )
+        stats = client.get(f'/api/v1/titles/{title_id}/stats/').json()
+        assert stats['count'] == 1 and stats['mean'] == 1.0
+
+    @pytest.mark.django_db(transaction=True)
+    def test_03_concurrent_bumps(self, user_client, admin):
+        _, _, titles, _, _ = create_comments(user_client, admin)
+        title_id = titles[0]['id']
+        current = version(title_id)
+
+        def bump(_):
+            try:
+                Title.bump_version(title_id)
+            finally:
+                connection.close()
+
+        with ThreadPoolExecutor(max_workers=THREADS) as executor:
+            list(executor.map(bump, range(BUMPS)))
+        assert version(title_id) == current + BUMPS, (
+            'Проверьте, что версия произведения увеличивается атомарно'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_04_cascade_delete(self, client, user_client, admin):
+        comments, reviews, titles, user, _ = create_comments(user_client,
+                                                             admin)
+        title_id = titles[0]['id']
+        stats_url = f'/api/v1/titles/{title_id}/stats/'
+        before = client.get(f'/api/v1/titles/{title_id}/').json()
+        before_stats = client.get(stats_url).json()
+        user_reviews = Review.objects.filter(author=user, title_id=title_id)
+        user_score = user_reviews.get().score
+        current = version(title_id)
+
+        response = user_client.delete(f'/api/v1/users/{user.username}/')
+        assert response.status_code == 204
+        assert not user_reviews.exists()
+        title = Title.objects.get(pk=title_id)
+        assert title.version > current, (
+            'Проверьте, что каскадное удаление отзывов увеличивает версию произведения'
+        )
+        assert (title.rating_sum, title.rating_count) == (
+            before['rating'] * before_stats['count'] - user_score,
+            before_stats['count'] - 1
+        ), (
+            'Проверьте, что каскадное удаление отзывов пересчитывает рейтинг'
+        )
+        stats = client.get(stats_url).json()
+        assert stats['count'] == before_stats['count'] - 1, (
+            'Проверьте, что каскадное удаление отзывов пересчитывает распределение оценок'
+        )
+        assert client.get(f'/api/v1/titles/{title_id}/').json()['rating'] == (
+            title.rating
+        )
+
+        Title.objects.filter(pk=title_id).delete()
+        assert not Review.objects.filter(title_id=title_id).exists()
@@ -2,9 +2,10 @@ from django.apps import apps
 from django.contrib import admin
 from django.contrib.admin.sites import AlreadyRegistered
 
-from .models import Category, Comment, CustomUser, Genre, Review, Title
+from .models import (Category, Comment, CustomUser, Genre, QueuedEmail,
+                     Review, Title)
 
-model = Review, Comment, Title, Category, Genre, CustomUser
+model = Title, Category, Genre, CustomUser, QueuedEmail
 models = apps.get_models(model)
 
 try:
@@ -14,6 +15,7 @@ except AlreadyRegistered:
     pass
 
 
+@admin.register(Review)
 class ReviewAdmin(admin.ModelAdmin):
     list_display = ('id', 'text', 'author', 'title', 'pub_date')
 
@@ -25,9 +27,14 @@ class TitlesAdmin(admin.ModelAdmin):
     empty_value_display = '-пусто-'
 
 
+@admin.register(Comment)
 class CommentsAdmin(admin.ModelAdmin):
     list_display = ('review', 'text')
 
+    def save_model(self, request, obj, form, change):
+        obj.title_id = obj.review.title_id
+        super().save_model(request, obj, form, change)
+
 
 class CategoriesAdmin(admin.ModelAdmin):
     list_display = ('name', 'slug')
@@ -3,3 +3,6 @@ from django.apps import AppConfig
 
 class YamdbConfig(AppConfig):
     name = 'yamdb'
+
+    def ready(self):
+        from . import checks, signals  # noqa: F401
@@ -1,19 +1,116 @@
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
 from django.contrib.auth import get_user_model
 from django.contrib.auth.backends import BaseBackend
-
-from yamdb.models import UserRole
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.settings import api_settings
 
 User = get_user_model()
 
 
+USER_VERSION_KEY = 'yamdb:auth:user:{}'
+
+
+def get_user_version(user_id):
+    # Ключ живёт JWT_USER_CACHE_TIMEOUT: истёкшая версия заменяется новой,
+    # и записи процесса просто перечитываются из БД.
+    key = USER_VERSION_KEY.format(user_id)
+    version = cache.get(key)
+    if version is None:
+        cache.add(key, time.time_ns(), settings.JWT_USER_CACHE_TIMEOUT)
+        version = cache.get(key)
+    return version
+
+
+def bump_user_version(user_id):
+    cache.set(USER_VERSION_KEY.format(user_id), time.time_ns(),
+              settings.JWT_USER_CACHE_TIMEOUT)
+
+
+class UserCache:
+    """
+    LRU-кэш пользователей процесса. Запись действительна, пока версия
+    пользователя в общем кэше (get_user_version) не изменилась: изменение,
+    сделанное в другом процессе, сбрасывает записи во всех процессах.
+    """
+
+    def __init__(self, max_size, timeout):
+        self.max_size = max_size
+        self.timeout = timeout
+        self.field_names = [field.attname
+                            for field in User._meta.concrete_fields]
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+
+    def get(self, user_id, version):
+        with self.lock:
+            entry = self.entries.get(user_id)
+            if entry is None:
+                return None
+            expires, entry_version, values = entry
+            if expires < time.monotonic() or entry_version != version:
+                del self.entries[user_id]
+                return None
+            self.entries.move_to_end(user_id)
+        return User.from_db(DEFAULT_DB_ALIAS, self.field_names, values)
+
+    def set(self, user_id, user, version):
+        values = [getattr(user, name) for name in self.field_names]
+        with self.lock:
+            self.entries[user_id] = (time.monotonic() + self.timeout,
+                                     version, values)
+            self.entries.move_to_end(user_id)
+            while len(self.entries) > self.max_size:
+                self.entries.popitem(last=False)
+
+    def delete(self, user_id):
+        with self.lock:
+            self.entries.pop(user_id, None)
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+
+
+user_cache = UserCache(settings.JWT_USER_CACHE_SIZE,
+                       settings.JWT_USER_CACHE_TIMEOUT)
+
+
+class CachedJWTAuthentication(JWTAuthentication):
+
+    def get_user(self, validated_token):
+        user_id = validated_token.get(api_settings.USER_ID_CLAIM)
+        if user_id is None:
+            return super().get_user(validated_token)
+        # Версия читается до загрузки из БД: если пользователь изменится
+        # между чтениями, запись получит старую версию и не будет выдана.
+        version = get_user_version(user_id)
+        user = user_cache.get(user_id, version)
+        if user is None:
+            user = super().get_user(validated_token)
+            user_cache.set(user_id, user, version)
+        return user
+
+
+def get_or_create_user(email):
+    user, _ = User.objects.get_or_create(email=email,
+                                         defaults={'username': email})
+    return user
+
+
 class AuthenticationWithoutPassword(BaseBackend):
 
     def authenticate(self, request, username=None, password=None, **kwargs):
         email = kwargs.get('email')
-        try:
-            user = User.objects.get(email=email)
-        except User.DoesNotExist:
-            user = User(email=email)
-            user.username = user.email
-            user.save()
-        return user
+        if not email:
+            return None
+        user = get_or_create_user(email)
+        return user if user.is_active else None
+
+    def get_user(self, user_id):
+        return User.objects.filter(pk=user_id, is_active=True).first()
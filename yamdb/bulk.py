@@ -0,0 +1,231 @@
+from django.conf import settings
+from django.db import NotSupportedError, connection, transaction
+from rest_framework import serializers
+from rest_framework.exceptions import ValidationError
+
+from .models import Category, Genre, Title, validate_slug_not_reserved
+from .search import get_search_backend
+
+TITLE_FIELDS = ('name', 'year', 'description')
+
+
+class TitleBulkSerializer(serializers.ModelSerializer):
+    id = serializers.IntegerField(required=False)
+    genre = serializers.ListField(child=serializers.SlugField(),
+                                  required=False)
+    category = serializers.SlugField(required=False, allow_null=True)
+
+    class Meta:
+        fields = ('id', 'name', 'year', 'genre',
+                  'category', 'description')
+        model = Title
+
+
+class SlugBulkSerializer(serializers.Serializer):
+    name = serializers.CharField(max_length=200)
+    slug = serializers.SlugField(max_length=100,
+                                 validators=[validate_slug_not_reserved])
+
+
+def validate_items(serializer_class, items, partial=False):
+    if not isinstance(items, list):
+        raise ValidationError({'non_field_errors': ['Ожидается список.']})
+    if len(items) > settings.BULK_MAX_ITEMS:
+        raise ValidationError({'non_field_errors': [
+            f'Не больше {settings.BULK_MAX_ITEMS} объектов за запрос.'
+        ]})
+    validated, errors = [], []
+    for item in items:
+        serializer = serializer_class(data=item, partial=partial)
+        if serializer.is_valid():
+            validated.append(serializer.validated_data)
+            errors.append({})
+        else:
+            validated.append(None)
+            errors.append(serializer.errors)
+    return validated, errors
+
+
+def bulk_create_with_pks(model, objs):
+    objs = model.objects.bulk_create(objs)
+    if connection.features.can_return_rows_from_bulk_insert or not objs:
+        return objs
+    # Только SQLite: первичные ключи читаются обратно как последние N
+    # строк таблицы. Это верно лишь потому, что SQLite выполняет записи
+    # последовательно, а вызов идёт внутри транзакции; при параллельных
+    # вставках другой СУБД вернулись бы чужие строки.
+    if connection.vendor != 'sqlite':
+        raise NotSupportedError(
+            'bulk_create без RETURNING поддерживается только для SQLite.'
+        )
+    pks = model.objects.order_by('-pk').values_list(
+        'pk', flat=True
+    )[:len(objs)]
+    for obj, pk in zip(objs, reversed(pks)):
+        obj.pk = pk
+    return objs
+
+
+def resolve_slugs(model, validated, field, many=False):
+    slugs = set()
+    for data in validated:
+        if data and data.get(field):
+            slugs.update(data[field] if many else [data[field]])
+    if not slugs:
+        return {}
+    return dict(model.objects.filter(slug__in=slugs).values_list('slug',
+                                                                 'pk'))
+
+
+def check_title_slugs(validated, errors, genres, categories):
+    for data, error in zip(validated, errors):
+        if data is None:
+            continue
+        unknown = [slug for slug in data.get('genre', [])
+                   if slug not in genres]
+        if unknown:
+            error['genre'] = [f'Жанр {slug} не найден.' for slug in unknown]
+        category = data.get('category')
+        if category and category not in categories:
+            error['category'] = [f'Категория {category} не найдена.']
+
+
+def title_genres(titles, validated, genres):
+    through = Title.genre.through
+    return [
+        through(title_id=title.pk, genre_id=genres[slug])
+        for title, data in zip(titles, validated)
+        for slug in dict.fromkeys(data.get('genre', []))
+    ]
+
+
+def title_result(title, data):
+    return {'id': title.pk,
+            **{key: value for key, value in data.items() if key != 'id'}}
+
+
+def create_titles(items):
+    validated, errors = validate_items(TitleBulkSerializer, items)
+    genres = resolve_slugs(Genre, validated, 'genre', many=True)
+    categories = resolve_slugs(Category, validated, 'category')
+    check_title_slugs(validated, errors, genres, categories)
+    if any(errors):
+        return None, errors
+    with transaction.atomic():
+        titles = bulk_create_with_pks(Title, [
+            Title(name=data['name'], year=data['year'],
+                  description=data['description'],
+                  category_id=categories.get(data.get('category')))
+            for data in validated
+        ])
+        Title.genre.through.objects.bulk_create(
+            title_genres(titles, validated, genres)
+        )
+        get_search_backend().index(titles)
+    return [title_result(title, data)
+            for title, data in zip(titles, validated)], None
+
+
+def check_title_ids(validated, errors, titles):
+    seen = set()
+    for data, error in zip(validated, errors):
+        if data is None:
+            continue
+        pk = data.get('id')
+        if pk is None:
+            error['id'] = ['Обязательное поле.']
+        elif pk not in titles:
+            error['id'] = [f'Произведение {pk} не найдено.']
+        elif pk in seen:
+            error['id'] = [f'Произведение {pk} указано несколько раз.']
+        seen.add(pk)
+
+
+def apply_title_fields(titles, validated, categories):
+    fields = set()
+    for title, data in zip(titles, validated):
+        for field in TITLE_FIELDS:
+            if field in data:
+                setattr(title, field, data[field])
+                fields.add(field)
+        if 'category' in data:
+            title.category_id = categories.get(data['category'])
+            fields.add('category')
+    return fields
+
+
+def update_titles(items):
+    validated, errors = validate_items(TitleBulkSerializer, items,
+                                       partial=True)
+    ids = [data.get('id') for data in validated if data]
+    titles = Title.objects.in_bulk([pk for pk in ids if pk is not None])
+    check_title_ids(validated, errors, titles)
+    genres = resolve_slugs(Genre, validated, 'genre', many=True)
+    categories = resolve_slugs(Category, validated, 'category')
+    check_title_slugs(validated, errors, genres, categories)
+    if any(errors):
+        return None, errors
+
+    updated = [titles[data['id']] for data in validated]
+    fields = apply_title_fields(updated, validated, categories)
+    with_genres = [(title, data) for title, data in zip(updated, validated)
+                   if 'genre' in data]
+    with transaction.atomic():
+        if fields:
+            Title.objects.bulk_update(updated, fields)
+        if with_genres:
+            through = Title.genre.through
+            through.objects.filter(
+                title_id__in=[title.pk for title, _ in with_genres]
+            ).delete()
+            through.objects.bulk_create(title_genres(
+                [title for title, _ in with_genres],
+                [data for _, data in with_genres],
+                genres
+            ))
+        get_search_backend().index(updated)
+    return [title_result(title, data)
+            for title, data in zip(updated, validated)], None
+
+
+def create_slugged(model, items):
+    validated, errors = validate_items(SlugBulkSerializer, items)
+    existing = resolve_slugs(model, validated, 'slug')
+    seen = set()
+    for data, error in zip(validated, errors):
+        if data is None:
+            continue
+        if data['slug'] in existing or data['slug'] in seen:
+            error['slug'] = [f'Slug {data["slug"]} уже используется.']
+        seen.add(data['slug'])
+    if any(errors):
+        return None, errors
+    with transaction.atomic():
+        model.objects.bulk_create(model(**data) for data in validated)
+    return [dict(data) for data in validated], None
+
+
+def update_slugged(model, items):
+    validated, errors = validate_items(SlugBulkSerializer, items)
+    existing = model.objects.in_bulk(
+        [data['slug'] for data in validated if data], field_name='slug'
+    )
+    seen = set()
+    for data, error in zip(validated, errors):
+        if data is None:
+            continue
+        if data['slug'] not in existing:
+            error['slug'] = [f'Объект {data["slug"]} не найден.']
+        elif data['slug'] in seen:
+            error['slug'] = [f'Объект {data["slug"]} указан несколько раз.']
+        seen.add(data['slug'])
+    if any(errors):
+        return None, errors
+    objs = []
+    for data in validated:
+        obj = existing[data['slug']]
+        obj.name = data['name']
+        objs.append(obj)
+    with transaction.atomic():
+        model.objects.bulk_update(objs, ['name'])
+    return [dict(data) for data in validated], None
@@ -0,0 +1,161 @@
+import hashlib
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.utils.http import (http_date, parse_etags, parse_http_date_safe,
+                               quote_etag)
+from rest_framework import status
+from rest_framework.response import Response
+
+VERSION_KEY = 'yamdb:version:{}'
+MODIFIED_KEY = 'yamdb:modified:{}'
+
+
+def get_version(namespace):
+    key = VERSION_KEY.format(namespace)
+    version = cache.get(key)
+    if version is None:
+        cache.add(MODIFIED_KEY.format(namespace), time.time(), None)
+        cache.add(key, time.time_ns(), None)
+        version = cache.get(key)
+    return version
+
+
+def get_versions(namespaces):
+    """
+    Версии и время последнего изменения нескольких пространств
+    за одно обращение к кэшу.
+    """
+    keys = [VERSION_KEY.format(namespace) for namespace in namespaces]
+    modified_keys = [MODIFIED_KEY.format(namespace)
+                     for namespace in namespaces]
+    values = cache.get_many(keys + modified_keys)
+    versions = []
+    for namespace, key in zip(namespaces, keys):
+        version = values.get(key)
+        versions.append(version if version is not None
+                        else get_version(namespace))
+    modified = [values[key] for key in modified_keys if key in values]
+    return versions, max(modified) if len(modified) == len(keys) else None
+
+
+def bump_version(namespace):
+    # Новая версия записывается через set, а не incr: в файловом кэше incr
+    # не атомарен, и два одновременных изменения получили бы одну версию.
+    version = time.time_ns()
+    cache.set_many({VERSION_KEY.format(namespace): version,
+                    MODIFIED_KEY.format(namespace): time.time()}, None)
+    return version
+
+
+def bump_on_commit(*namespaces):
+    def bump():
+        for namespace in namespaces:
+            bump_version(namespace)
+    transaction.on_commit(bump)
+
+
+def make_etag(*parts):
+    digest = hashlib.md5(
+        ':'.join(str(part) for part in parts).encode()
+    ).hexdigest()
+    return quote_etag(digest)
+
+
+def etag_matches(request, etag):
+    if_none_match = request.META.get('HTTP_IF_NONE_MATCH')
+    if not if_none_match:
+        return False
+    etags = parse_etags(if_none_match)
+    return '*' in etags or etag in etags
+
+
+def last_modified_header(modified):
+    # Секунда изменения должна закончиться: иначе запись в ту же секунду
+    # не изменит Last-Modified и If-Modified-Since вернёт устаревший 304.
+    if modified is None or int(modified) >= int(time.time()):
+        return None
+    return http_date(modified)
+
+
+def not_modified(request, etag, last_modified):
+    if request.META.get('HTTP_IF_NONE_MATCH'):
+        return etag_matches(request, etag)
+    if last_modified is None:
+        return False
+    since = parse_http_date_safe(
+        request.META.get('HTTP_IF_MODIFIED_SINCE', '')
+    )
+    return since is not None and since >= parse_http_date_safe(last_modified)
+
+
+class ConditionalGetMixin:
+    """
+    ETag и Last-Modified для list и retrieve по версиям пространств
+    condition_namespaces: 304 отдаётся до запросов к БД и сериализации.
+    """
+    condition_namespaces = ()
+
+    def get_condition_namespaces(self):
+        return self.condition_namespaces
+
+    def get_condition_state(self):
+        """
+        Дополнительные части ETag и время изменения (datetime) помимо
+        пространств, например версия произведения.
+        """
+        return (), None
+
+    def list(self, request, *args, **kwargs):
+        return self.conditional_get(super().list, request, *args, **kwargs)
+
+    def retrieve(self, request, *args, **kwargs):
+        return self.conditional_get(super().retrieve, request,
+                                    *args, **kwargs)
+
+    def conditional_get(self, handler, request, *args, **kwargs):
+        namespaces = self.get_condition_namespaces()
+        versions, modified = get_versions(namespaces)
+        parts, state_modified = self.get_condition_state()
+        if parts and modified is not None:
+            modified = (max(modified, state_modified.timestamp())
+                        if state_modified is not None else None)
+        etag = make_etag(*namespaces, *versions, *parts,
+                         request.accepted_renderer.format,
+                         request.get_full_path())
+        last_modified = last_modified_header(modified)
+        headers = {'ETag': etag}
+        if last_modified:
+            headers['Last-Modified'] = last_modified
+        if not_modified(request, etag, last_modified):
+            return Response(status=status.HTTP_304_NOT_MODIFIED,
+                            headers=headers)
+        response = handler(request, *args, **kwargs)
+        if response.status_code == status.HTTP_200_OK:
+            for name, value in headers.items():
+                response[name] = value
+        return response
+
+
+class CachedListMixin:
+    cache_namespace = None
+
+    def list(self, request, *args, **kwargs):
+        version = get_version(self.cache_namespace)
+        etag = make_etag(self.cache_namespace, version,
+                         request.accepted_renderer.format,
+                         request.get_full_path())
+        if etag_matches(request, etag):
+            return Response(status=status.HTTP_304_NOT_MODIFIED,
+                            headers={'ETag': etag})
+        key = f'yamdb:list:{etag}'
+        data = cache.get(key)
+        if data is None:
+            response = super().list(request, *args, **kwargs)
+            cache.set(key, response.data, settings.LIST_CACHE_TIMEOUT)
+        else:
+            response = Response(data)
+        response['ETag'] = etag
+        return response
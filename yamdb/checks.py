@@ -0,0 +1,29 @@
+from django.conf import settings
+from django.core.checks import Tags, Warning, register
+
+LOCAL_CACHE_BACKENDS = (
+    'django.core.cache.backends.locmem.LocMemCache',
+    'django.core.cache.backends.dummy.DummyCache',
+)
+FILE_CACHE_BACKEND = 'django.core.cache.backends.filebased.FileBasedCache'
+
+
+@register(Tags.caches)
+def check_shared_cache(app_configs, **kwargs):
+    backend = settings.CACHES.get('default', {}).get('BACKEND')
+    if backend in LOCAL_CACHE_BACKENDS:
+        return [Warning(
+            f'Кэш {backend} не общий для процессов приложения.',
+            hint=('Версии ETag, троттлинг и версии пользователей хранятся '
+                  'в кэше default: при нескольких процессах нужен общий '
+                  'кэш (memcached).'),
+            id='yamdb.W001',
+        )]
+    if backend == FILE_CACHE_BACKEND:
+        return [Warning(
+            f'Кэш {backend} медленный для частых записей.',
+            hint=('Файловый кэш при каждой записи обходит каталог, а incr '
+                  'в нём не атомарен: используйте memcached.'),
+            id='yamdb.W002',
+        )]
+    return []
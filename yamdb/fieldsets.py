@@ -0,0 +1,58 @@
+from rest_framework.permissions import SAFE_METHODS
+
+FIELDS_PARAM = 'fields'
+EXCLUDE_PARAM = 'exclude'
+
+
+def split_param(query_params, name):
+    value = query_params.get(name)
+    if not value:
+        return None
+    return {item.strip() for item in value.split(',') if item.strip()}
+
+
+def get_sparse_fields(request, available):
+    if request is None or request.method not in SAFE_METHODS:
+        return list(available)
+    fields = split_param(request.query_params, FIELDS_PARAM)
+    exclude = split_param(request.query_params, EXCLUDE_PARAM) or set()
+    return [name for name in available
+            if (fields is None or name in fields) and name not in exclude]
+
+
+class SparseFieldsetSerializerMixin:
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        selected = set(get_sparse_fields(self.context.get('request'),
+                                         self.fields))
+        for name in list(self.fields):
+            if name not in selected:
+                self.fields.pop(name)
+
+
+class SparseFieldsetMixin:
+    sparse_required_columns = ('id',)
+    sparse_columns = {}
+    sparse_select_related = {}
+    sparse_prefetch_related = {}
+
+    def filter_queryset(self, queryset):
+        queryset = super().filter_queryset(queryset)
+        if self.request.method not in SAFE_METHODS:
+            return queryset
+        fields = get_sparse_fields(self.request,
+                                   self.get_serializer_class().Meta.fields)
+        queryset = queryset.select_related(None).prefetch_related(None)
+        columns = set(self.sparse_required_columns)
+        for name in fields:
+            columns.update(self.sparse_columns.get(name, (name,)))
+            if name in self.sparse_select_related:
+                queryset = queryset.select_related(
+                    self.sparse_select_related[name]
+                )
+            if name in self.sparse_prefetch_related:
+                queryset = queryset.prefetch_related(
+                    self.sparse_prefetch_related[name]
+                )
+        return queryset.only(*columns)
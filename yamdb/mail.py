@@ -0,0 +1,119 @@
+import logging
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.mail import EmailMessage, get_connection
+from django.db import transaction
+from django.db.models import (Avg, Count, DurationField, ExpressionWrapper,
+                              F, Min)
+from django.utils import timezone
+
+from .models import QueuedEmail
+
+logger = logging.getLogger(__name__)
+
+
+def enqueue_mail(subject, message, recipient_list, from_email=None):
+    return QueuedEmail.objects.bulk_create(
+        QueuedEmail(subject=subject, body=message,
+                    from_email=from_email or settings.DEFAULT_FROM_EMAIL,
+                    recipient=recipient)
+        for recipient in recipient_list
+    )
+
+
+def pending_mail():
+    return QueuedEmail.objects.filter(
+        sent_at__isnull=True,
+        attempts__lt=settings.EMAIL_QUEUE_MAX_ATTEMPTS
+    )
+
+
+def retry_delay(attempts):
+    return timedelta(
+        seconds=settings.EMAIL_QUEUE_RETRY_DELAY * 2 ** (attempts - 1)
+    )
+
+
+def claim_mail(batch_size, now):
+    """
+    Забирает пачку писем в короткой транзакции: send_after сдвигается на
+    EMAIL_QUEUE_LEASE, и другие обработчики её не возьмут. Если процесс
+    упадёт во время отправки, письма вернутся в очередь после истечения
+    аренды.
+    """
+    lease_until = now + timedelta(seconds=settings.EMAIL_QUEUE_LEASE)
+    with transaction.atomic():
+        pks = list(
+            pending_mail().filter(send_after__lte=now)
+            .select_for_update(skip_locked=True)
+            .values_list('pk', flat=True)[:batch_size]
+        )
+        if not pks:
+            return []
+        pending_mail().filter(pk__in=pks, send_after__lte=now).update(
+            send_after=lease_until, attempts=F('attempts') + 1
+        )
+    return list(QueuedEmail.objects.filter(pk__in=pks,
+                                           send_after=lease_until))
+
+
+def deliver_queued_mail(batch_size=None):
+    batch_size = batch_size or settings.EMAIL_QUEUE_BATCH_SIZE
+    now = timezone.now()
+    sent = failed = 0
+    batch = claim_mail(batch_size, now)
+    if not batch:
+        return sent, failed
+    # Письма отправляются вне транзакции: открытая транзакция держала бы
+    # блокировку БД всё время работы с SMTP.
+    connection = get_connection(fail_silently=False)
+    connection.open()
+    try:
+        for email in batch:
+            message = EmailMessage(email.subject, email.body,
+                                   email.from_email, [email.recipient],
+                                   connection=connection)
+            try:
+                message.send()
+            except Exception as error:
+                logger.warning('Не удалось отправить письмо %s: %s',
+                               email.pk, error)
+                email.last_error = str(error)
+                email.send_after = now + retry_delay(email.attempts)
+                failed += 1
+            else:
+                email.sent_at = timezone.now()
+                email.last_error = ''
+                sent += 1
+    finally:
+        connection.close()
+    QueuedEmail.objects.bulk_update(batch,
+                                    ['sent_at', 'send_after', 'last_error'])
+    return sent, failed
+
+
+def mail_queue_stats(window=timedelta(hours=1)):
+    now = timezone.now()
+    pending = pending_mail().aggregate(depth=Count('pk'),
+                                       oldest=Min('created'))
+    delivery = QueuedEmail.objects.filter(
+        sent_at__gte=now - window
+    ).aggregate(latency=Avg(ExpressionWrapper(
+        F('sent_at') - F('created'), output_field=DurationField()
+    )))
+    return {
+        'pending': pending['depth'],
+        'failed': QueuedEmail.objects.filter(
+            sent_at__isnull=True,
+            attempts__gte=settings.EMAIL_QUEUE_MAX_ATTEMPTS
+        ).count(),
+        'oldest_pending_seconds': (
+            (now - pending['oldest']).total_seconds()
+            if pending['oldest'] else 0
+        ),
+        'avg_delivery_seconds': (
+            delivery['latency'].total_seconds()
+            if delivery['latency'] else 0
+        ),
+    }
@@ -0,0 +1,175 @@
+import csv
+import os
+import time
+from contextlib import contextmanager
+from itertools import islice
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.core.management.color import no_style
+from django.db import connection, transaction
+from django.utils.dateparse import parse_datetime
+
+from yamdb.caching import bump_version
+from yamdb.models import (Category, Comment, CustomUser, Genre, Review, Title,
+                          TitleRanking, TitleScore)
+from yamdb.search import get_search_backend
+
+
+@contextmanager
+def keep_pub_date(*models):
+    fields = [model._meta.get_field('pub_date') for model in models]
+    for field in fields:
+        field.auto_now_add = False
+    try:
+        yield
+    finally:
+        for field in fields:
+            field.auto_now_add = True
+
+
+class Command(BaseCommand):
+    help = 'Загружает данные из CSV-файлов каталога data/.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--path',
+            default=os.path.join(settings.BASE_DIR, 'data'),
+            help='Каталог с CSV-файлами.'
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=1000,
+            help='Количество строк в одном bulk_create.'
+        )
+
+    def handle(self, *args, **options):
+        self.path = options['path']
+        self.batch_size = options['batch_size']
+        if self.batch_size < 1:
+            raise CommandError('--batch-size должен быть больше нуля.')
+        self.ids = {}
+        self.review_titles = {}
+        self.review_authors = set()
+        loaders = (
+            ('category.csv', Category, self.build_category),
+            ('genre.csv', Genre, self.build_genre),
+            ('titles.csv', Title, self.build_title),
+            ('genre_title.csv', Title.genre.through, self.build_genre_title),
+            ('users.csv', CustomUser, self.build_user),
+            ('review.csv', Review, self.build_review),
+            ('comments.csv', Comment, self.build_comment),
+        )
+        started = time.perf_counter()
+        total = 0
+        with transaction.atomic(), keep_pub_date(Review, Comment):
+            for filename, model, build in loaders:
+                total += self.load(filename, model, build)
+            self.reset_sequences([model for _, model, _ in loaders])
+            Title.rebuild_ratings()
+            TitleScore.rebuild()
+            TitleRanking.refresh()
+            get_search_backend().rebuild()
+        for namespace in ('categories', 'genres', 'titles', 'users'):
+            bump_version(namespace)
+        elapsed = time.perf_counter() - started
+        self.stdout.write(self.style.SUCCESS(
+            f'Загружено строк: {total} за {elapsed:.2f} с '
+            f'({total / max(elapsed, 1e-9):.0f} строк/с)'
+        ))
+
+    def load(self, filename, model, build):
+        filepath = os.path.join(self.path, filename)
+        if not os.path.exists(filepath):
+            raise CommandError(f'Файл {filepath} не найден.')
+        self.ids[model] = set()
+        started = time.perf_counter()
+        loaded = skipped = 0
+        with open(filepath, encoding='utf-8', newline='') as csv_file:
+            rows = csv.DictReader(csv_file)
+            while True:
+                batch = []
+                for row in islice(rows, self.batch_size):
+                    obj = build(row)
+                    if obj is None:
+                        skipped += 1
+                        continue
+                    batch.append(obj)
+                if not batch:
+                    break
+                model.objects.bulk_create(batch, batch_size=self.batch_size)
+                self.ids[model].update(obj.pk for obj in batch)
+                loaded += len(batch)
+        elapsed = time.perf_counter() - started
+        message = (f'{filename}: {loaded} строк за {elapsed:.2f} с '
+                   f'({loaded / max(elapsed, 1e-9):.0f} строк/с)')
+        if skipped:
+            message += f', пропущено {skipped}'
+        self.stdout.write(message)
+        return loaded
+
+    def reset_sequences(self, models):
+        statements = connection.ops.sequence_reset_sql(no_style(), models)
+        with connection.cursor() as cursor:
+            for sql in statements:
+                cursor.execute(sql)
+
+    def exists(self, model, pk):
+        return pk is not None and int(pk) in self.ids[model]
+
+    def build_category(self, row):
+        return Category(id=int(row['id']), name=row['name'],
+                        slug=row['slug'])
+
+    def build_genre(self, row):
+        return Genre(id=int(row['id']), name=row['name'], slug=row['slug'])
+
+    def build_title(self, row):
+        category_id = row.get('category') or None
+        if category_id is not None and not self.exists(Category, category_id):
+            category_id = None
+        return Title(id=int(row['id']), name=row['name'],
+                     year=int(row['year']), category_id=category_id,
+                     description=row.get('description') or '')
+
+    def build_genre_title(self, row):
+        if not (self.exists(Title, row['title_id'])
+                and self.exists(Genre, row['genre_id'])):
+            return None
+        return Title.genre.through(id=int(row['id']),
+                                   title_id=int(row['title_id']),
+                                   genre_id=int(row['genre_id']))
+
+    def build_user(self, row):
+        user = CustomUser(id=int(row['id']), username=row['username'],
+                          email=row['email'], role=row['role'],
+                          bio=row.get('description') or None,
+                          first_name=row.get('first_name') or '',
+                          last_name=row.get('last_name') or '')
+        user.set_unusable_password()
+        return user
+
+    def build_review(self, row):
+        if not (self.exists(Title, row['title_id'])
+                and self.exists(CustomUser, row['author'])):
+            return None
+        author_title = (int(row['author']), int(row['title_id']))
+        if author_title in self.review_authors:
+            return None
+        self.review_authors.add(author_title)
+        review = Review(id=int(row['id']), title_id=int(row['title_id']),
+                        text=row['text'], author_id=int(row['author']),
+                        score=int(row['score']),
+                        pub_date=parse_datetime(row['pub_date']))
+        self.review_titles[review.id] = review.title_id
+        return review
+
+    def build_comment(self, row):
+        title_id = self.review_titles.get(int(row['review_id']))
+        if title_id is None or not self.exists(CustomUser, row['author']):
+            return None
+        return Comment(id=int(row['id']), title_id=title_id,
+                       review_id=int(row['review_id']), text=row['text'],
+                       author_id=int(row['author']),
+                       pub_date=parse_datetime(row['pub_date']))
@@ -0,0 +1,20 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from yamdb.caching import bump_version
+from yamdb.models import Title, TitleScore
+
+
+class Command(BaseCommand):
+    help = ('Пересчитывает сохранённые рейтинги и распределения оценок '
+            'произведений по отзывам.')
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            updated = Title.rebuild_ratings()
+            scores = TitleScore.rebuild()
+        bump_version('titles')
+        self.stdout.write(self.style.SUCCESS(
+            f'Рейтинги пересчитаны: {updated}, '
+            f'строк распределения оценок: {scores}'
+        ))
@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+
+from yamdb.models import TitleRanking
+
+
+class Command(BaseCommand):
+    help = ('Пересчитывает рейтинг лучших произведений: общий, '
+            'по категориям и по жанрам.')
+
+    def handle(self, *args, **options):
+        created = TitleRanking.refresh()
+        self.stdout.write(self.style.SUCCESS(
+            f'Рейтинг обновлён, позиций: {created}'
+        ))
@@ -0,0 +1,47 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from yamdb.mail import deliver_queued_mail, mail_queue_stats
+
+
+class Command(BaseCommand):
+    help = 'Отправляет письма из очереди.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=None,
+            help='Количество писем, отправляемых за одно соединение.'
+        )
+        parser.add_argument(
+            '--loop',
+            action='store_true',
+            help='Работать постоянно, опрашивая очередь.'
+        )
+        parser.add_argument(
+            '--interval',
+            type=float,
+            default=1.0,
+            help='Пауза между опросами пустой очереди, в секундах.'
+        )
+
+    def handle(self, *args, **options):
+        while True:
+            sent, failed = deliver_queued_mail(options['batch_size'])
+            if sent or failed:
+                self.stdout.write(f'Отправлено: {sent}, ошибок: {failed}')
+            if not options['loop']:
+                break
+            if not (sent or failed):
+                time.sleep(options['interval'])
+        self.stdout.write(self.format_stats())
+
+    def format_stats(self):
+        stats = mail_queue_stats()
+        return (f'В очереди: {stats["pending"]}, '
+                f'не доставлено: {stats["failed"]}, '
+                f'самое старое: {stats["oldest_pending_seconds"]:.1f} с, '
+                f'средняя задержка доставки: '
+                f'{stats["avg_delivery_seconds"]:.1f} с')
@@ -0,0 +1,46 @@
+# Generated by Django 3.1.7 on 2026-10-18 17:52
+
+from django.db import migrations, models
+from django.db.models import Count, F, Min
+
+
+def delete_duplicate_reviews(apps, schema_editor):
+    Review = apps.get_model('yamdb', 'Review')
+    Title = apps.get_model('yamdb', 'Title')
+    duplicates = Review.objects.values('author', 'title').annotate(
+        first_id=Min('id'), total=Count('id')
+    ).filter(total__gt=1).order_by()
+    for duplicate in duplicates:
+        extra = Review.objects.filter(
+            author=duplicate['author'], title=duplicate['title']
+        ).exclude(pk=duplicate['first_id'])
+        for review in extra:
+            Title.objects.filter(pk=review.title_id).update(
+                rating_sum=F('rating_sum') - review.score,
+                rating_count=F('rating_count') - 1
+            )
+            review.delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('yamdb', '0003_title_rating'),
+    ]
+
+    operations = [
+        migrations.RunPython(delete_duplicate_reviews,
+                             migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='comment',
+            index=models.Index(fields=['review', '-pub_date'], name='comment_review_pub_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='review',
+            index=models.Index(fields=['title', '-pub_date'], name='review_title_pub_date_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='review',
+            constraint=models.UniqueConstraint(fields=('author', 'title'), name='unique_review_author_title'),
+        ),
+    ]
@@ -0,0 +1,47 @@
+# Generated by Django 3.1.7 on 2026-10-18 18:26
+
+from django.db import migrations, models
+import django.db.models.deletion
+from django.db.models import Count
+
+
+def rebuild_scores(apps, schema_editor):
+    Review = apps.get_model('yamdb', 'Review')
+    TitleScore = apps.get_model('yamdb', 'TitleScore')
+    counts = Review.objects.order_by().values(
+        'title', 'score'
+    ).annotate(total=Count('pk'))
+    TitleScore.objects.bulk_create(
+        TitleScore(title_id=row['title'], score=row['score'],
+                   count=row['total'])
+        for row in counts
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('yamdb', '0006_queuedemail'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TitleScore',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('score', models.PositiveSmallIntegerField(verbose_name='Оценка')),
+                ('count', models.PositiveIntegerField(default=0, verbose_name='Число отзывов')),
+                ('title', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='scores', to='yamdb.title')),
+            ],
+            options={
+                'verbose_name': 'Распределение оценок',
+                'verbose_name_plural': 'Распределения оценок',
+                'ordering': ('title', 'score'),
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='titlescore',
+            constraint=models.UniqueConstraint(fields=('title', 'score'), name='unique_title_score'),
+        ),
+        migrations.RunPython(rebuild_scores, migrations.RunPython.noop),
+    ]
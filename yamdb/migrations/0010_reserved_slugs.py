@@ -0,0 +1,24 @@
+# Generated by Django 3.1.7 on 2026-10-18 18:52
+
+from django.db import migrations, models
+import yamdb.models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('yamdb', '0009_title_version'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='category',
+            name='slug',
+            field=models.SlugField(max_length=100, unique=True, validators=[yamdb.models.validate_slug_not_reserved]),
+        ),
+        migrations.AlterField(
+            model_name='genre',
+            name='slug',
+            field=models.SlugField(max_length=100, unique=True, validators=[yamdb.models.validate_slug_not_reserved]),
+        ),
+    ]
@@ -1,18 +1,57 @@
+from collections import defaultdict
 from datetime import datetime
 
+from django.conf import settings
 from django.contrib.auth.models import AbstractUser
+from django.core.exceptions import ValidationError
 from django.core.validators import MaxValueValidator, MinValueValidator
-from django.db import models
+from django.db import IntegrityError, models, transaction
+from django.db.models import Count, F, OuterRef, Subquery, Sum
+from django.db.models.functions import Coalesce
+from django.utils import timezone
 from django.utils.translation import gettext_lazy as _
 
 
+# Совпадают с путями действий списка: /categories/bulk/ перекрыл бы
+# объект со slug bulk.
+RESERVED_SLUGS = ('bulk',)
+
+
+def validate_slug_not_reserved(value):
+    if value in RESERVED_SLUGS:
+        raise ValidationError(f'Slug {value} зарезервирован.')
+
+
+class LoadedValuesMixin:
+    """
+    Запоминает значения полей, загруженные из БД: обработчики сигналов
+    сравнивают их с сохраняемыми, не перечитывая строку.
+    """
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance.remember_loaded_values()
+        return instance
+
+    def remember_loaded_values(self):
+        self._loaded_values = {
+            field.attname: self.__dict__[field.attname]
+            for field in self._meta.concrete_fields
+            if field.attname in self.__dict__
+        }
+
+    def get_loaded_value(self, attname):
+        return getattr(self, '_loaded_values', {}).get(attname)
+
+
 class UserRole(models.TextChoices):
     USER = 'user', _('User')
     MODERATOR = 'moderator', _('Moderator')
     ADMIN = 'admin', _('Admin')
 
 
-class CustomUser(AbstractUser):
+class CustomUser(LoadedValuesMixin, AbstractUser):
 
     role = models.CharField(
         _('User role'),
@@ -58,7 +97,8 @@ class Category(models.Model):
     name = models.CharField(verbose_name='Категория',
                             max_length=200)
     slug = models.SlugField(max_length=100,
-                            unique=True)
+                            unique=True,
+                            validators=[validate_slug_not_reserved])
 
     def __str__(self):
         return self.name
@@ -73,7 +113,8 @@ class Genre(models.Model):
     name = models.CharField(verbose_name='Жанр',
                             max_length=200)
     slug = models.SlugField(max_length=100,
-                            unique=True)
+                            unique=True,
+                            validators=[validate_slug_not_reserved])
 
     def __str__(self):
         return self.name
@@ -103,17 +144,73 @@ class Title(models.Model):
                                    verbose_name='Жанр',
                                    related_name='titles',
                                    blank=True, )
+    rating_sum = models.PositiveIntegerField(verbose_name='Сумма оценок',
+                                             default=0,
+                                             editable=False)
+    rating_count = models.PositiveIntegerField(verbose_name='Число оценок',
+                                               default=0,
+                                               editable=False)
+    version = models.PositiveIntegerField(verbose_name='Версия',
+                                          default=0,
+                                          editable=False)
+    modified = models.DateTimeField(verbose_name='Дата изменения',
+                                    null=True,
+                                    editable=False)
 
     def __str__(self):
         return self.name
 
+    @property
+    def rating(self):
+        if not self.rating_count:
+            return None
+        return self.rating_sum / self.rating_count
+
+    @classmethod
+    def bump_version(cls, title_id, **changes):
+        """
+        Увеличивает версию произведения. Вызывается при любом изменении
+        его отзывов и комментариев, в той же транзакции.
+        """
+        return cls.objects.filter(pk=title_id).update(
+            version=F('version') + 1, modified=timezone.now(), **changes
+        )
+
+    @classmethod
+    def get_version(cls, title_id):
+        return cls.objects.filter(pk=title_id).values_list(
+            'version', 'modified'
+        ).first()
+
+    @classmethod
+    def change_rating(cls, title_id, score_delta, count_delta=0):
+        cls.bump_version(
+            title_id,
+            rating_sum=F('rating_sum') + score_delta,
+            rating_count=F('rating_count') + count_delta
+        )
+
+    @classmethod
+    def rebuild_ratings(cls):
+        reviews = Review.objects.filter(
+            title=OuterRef('pk')
+        ).order_by().values('title')
+        return cls.objects.update(
+            rating_sum=Coalesce(Subquery(
+                reviews.annotate(total=Sum('score')).values('total')
+            ), 0),
+            rating_count=Coalesce(Subquery(
+                reviews.annotate(total=Count('pk')).values('total')
+            ), 0)
+        )
+
     class Meta:
         ordering = ['-id']
         verbose_name = 'Произведение'
         verbose_name_plural = 'Произведения'
 
 
-class Review(models.Model):
+class Review(LoadedValuesMixin, models.Model):
     title = models.ForeignKey(Title,
                               on_delete=models.CASCADE,
                               related_name='reviews',
@@ -134,11 +231,30 @@ class Review(models.Model):
 
     class Meta:
         ordering = ('-pub_date',)
+        indexes = [
+            models.Index(fields=['title', '-pub_date'],
+                         name='review_title_pub_date_idx'),
+        ]
+        constraints = [
+            models.UniqueConstraint(fields=['author', 'title'],
+                                    name='unique_review_author_title'),
+        ]
         verbose_name = 'Отзыв'
         verbose_name_plural = 'Отзывы'
 
+    @staticmethod
+    def change_score(title_id, old_score=None, new_score=None):
+        """
+        Учитывает создание, изменение или удаление отзыва в рейтинге,
+        распределении оценок и версии произведения.
+        """
+        Title.change_rating(title_id,
+                            (new_score or 0) - (old_score or 0),
+                            (new_score is not None) - (old_score is not None))
+        TitleScore.change_review(title_id, old_score, new_score)
 
-class Comment(models.Model):
+
+class Comment(LoadedValuesMixin, models.Model):
     title = models.ForeignKey(Title,
                               on_delete=models.CASCADE,
                               related_name='comments',
@@ -158,5 +274,175 @@ class Comment(models.Model):
 
     class Meta:
         ordering = ('-pub_date',)
+        indexes = [
+            models.Index(fields=['review', '-pub_date'],
+                         name='comment_review_pub_date_idx'),
+        ]
         verbose_name = 'Комментарий'
         verbose_name_plural = 'Комментарии'
+
+
+class TitleScore(models.Model):
+    title = models.ForeignKey(Title,
+                              on_delete=models.CASCADE,
+                              related_name='scores')
+    score = models.PositiveSmallIntegerField('Оценка')
+    count = models.PositiveIntegerField('Число отзывов', default=0)
+
+    class Meta:
+        ordering = ('title', 'score')
+        constraints = [
+            models.UniqueConstraint(fields=['title', 'score'],
+                                    name='unique_title_score'),
+        ]
+        verbose_name = 'Распределение оценок'
+        verbose_name_plural = 'Распределения оценок'
+
+    def __str__(self):
+        return f'{self.title_id}: {self.score} x {self.count}'
+
+    @classmethod
+    def change(cls, title_id, score, delta):
+        rows = cls.objects.filter(title_id=title_id, score=score)
+        if rows.update(count=F('count') + delta) or delta < 0:
+            return
+        try:
+            with transaction.atomic():
+                cls.objects.create(title_id=title_id, score=score,
+                                   count=delta)
+        except IntegrityError:
+            rows.update(count=F('count') + delta)
+
+    @classmethod
+    def change_review(cls, title_id, old_score=None, new_score=None):
+        if old_score == new_score:
+            return
+        if old_score is not None:
+            cls.change(title_id, old_score, -1)
+        if new_score is not None:
+            cls.change(title_id, new_score, 1)
+
+    @classmethod
+    def rebuild(cls):
+        cls.objects.all().delete()
+        counts = Review.objects.order_by().values(
+            'title', 'score'
+        ).annotate(total=Count('pk'))
+        return len(cls.objects.bulk_create(
+            cls(title_id=row['title'], score=row['score'],
+                count=row['total'])
+            for row in counts
+        ))
+
+    @classmethod
+    def stats(cls, title_id):
+        counts = dict(cls.objects.filter(
+            title_id=title_id, count__gt=0
+        ).values_list('score', 'count'))
+        total = sum(counts.values())
+        score_sum = sum(score * count for score, count in counts.items())
+        return {
+            'count': total,
+            'mean': score_sum / total if total else None,
+            'scores': [{'score': score, 'count': counts.get(score, 0)}
+                       for score in range(1, 11)],
+        }
+
+
+class TitleRanking(models.Model):
+    title = models.ForeignKey(Title,
+                              on_delete=models.CASCADE,
+                              related_name='rankings')
+    category = models.ForeignKey(Category,
+                                 on_delete=models.CASCADE,
+                                 related_name='+',
+                                 null=True,
+                                 blank=True)
+    genre = models.ForeignKey(Genre,
+                              on_delete=models.CASCADE,
+                              related_name='+',
+                              null=True,
+                              blank=True)
+    position = models.PositiveIntegerField('Место')
+    weighted_rating = models.FloatField('Взвешенный рейтинг')
+
+    class Meta:
+        ordering = ('position',)
+        indexes = [
+            models.Index(fields=['category', 'genre', 'position'],
+                         name='title_ranking_scope_idx'),
+        ]
+        verbose_name = 'Место в рейтинге'
+        verbose_name_plural = 'Рейтинг произведений'
+
+    def __str__(self):
+        return f'{self.position}. {self.title_id}'
+
+    @classmethod
+    def refresh(cls):
+        """
+        Пересобирает рейтинг: общий, по категориям и по жанрам.
+
+        Байесовская оценка (s + m * C) / (n + m), где s и n — сумма и
+        число оценок произведения, C — средняя оценка по всем отзывам,
+        m — TOP_TITLES_MIN_REVIEWS.
+        """
+        titles = list(Title.objects.filter(rating_count__gt=0).values_list(
+            'id', 'category_id', 'rating_sum', 'rating_count'
+        ))
+        rankings = []
+        if titles:
+            mean = (sum(title[2] for title in titles)
+                    / sum(title[3] for title in titles))
+            min_reviews = settings.TOP_TITLES_MIN_REVIEWS
+            weighted = {}
+            scopes = defaultdict(list)
+            for pk, category_id, rating_sum, rating_count in titles:
+                weighted[pk] = ((rating_sum + min_reviews * mean)
+                                / (rating_count + min_reviews))
+                scopes[None, None].append(pk)
+                if category_id is not None:
+                    scopes[category_id, None].append(pk)
+            for pk, genre_id in Title.genre.through.objects.filter(
+                    title__rating_count__gt=0).values_list('title_id',
+                                                           'genre_id'):
+                scopes[None, genre_id].append(pk)
+            for (category_id, genre_id), pks in scopes.items():
+                pks.sort(key=lambda pk: (-weighted[pk], -pk))
+                rankings.extend(
+                    cls(title_id=pk, category_id=category_id,
+                        genre_id=genre_id, position=position,
+                        weighted_rating=weighted[pk])
+                    for position, pk in enumerate(
+                        pks[:settings.TOP_TITLES_SIZE], 1
+                    )
+                )
+        with transaction.atomic():
+            cls.objects.all().delete()
+            cls.objects.bulk_create(rankings, batch_size=1000)
+        return len(rankings)
+
+
+class QueuedEmail(models.Model):
+    subject = models.CharField('Тема', max_length=255)
+    body = models.TextField('Текст')
+    from_email = models.CharField('Отправитель', max_length=254)
+    recipient = models.EmailField('Получатель')
+    created = models.DateTimeField('Дата создания', auto_now_add=True)
+    send_after = models.DateTimeField('Отправить после',
+                                      default=timezone.now)
+    sent_at = models.DateTimeField('Дата отправки', null=True, blank=True)
+    attempts = models.PositiveSmallIntegerField('Попытки', default=0)
+    last_error = models.TextField('Последняя ошибка', blank=True)
+
+    class Meta:
+        ordering = ('send_after',)
+        indexes = [
+            models.Index(fields=['sent_at', 'send_after'],
+                         name='queued_email_pending_idx'),
+        ]
+        verbose_name = 'Письмо в очереди'
+        verbose_name_plural = 'Очередь писем'
+
+    def __str__(self):
+        return f'{self.recipient}: {self.subject}'
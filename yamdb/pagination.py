@@ -0,0 +1,133 @@
+from collections import OrderedDict
+
+from django.conf import settings
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import (BasePagination, CursorPagination,
+                                       PageNumberPagination,
+                                       remove_query_param, replace_query_param)
+from rest_framework.response import Response
+
+FALSE_VALUES = ('0', 'false', 'no', 'off')
+
+
+class LimitedPageNumberPagination(PageNumberPagination):
+    """
+    Постраничная пагинация с ?page_size= (не больше MAX_PAGE_SIZE)
+    и ?count=false, отключающим запрос COUNT.
+    """
+    page_size_query_param = 'page_size'
+    max_page_size = settings.MAX_PAGE_SIZE
+    count_query_param = 'count'
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.with_count = self.get_with_count(request)
+        if self.with_count:
+            return super().paginate_queryset(queryset, request, view)
+
+        page_size = self.get_page_size(request)
+        if not page_size:
+            return None
+        page_number = request.query_params.get(self.page_query_param, 1)
+        try:
+            page_number = int(page_number)
+            if page_number < 1:
+                raise ValueError
+        except (TypeError, ValueError):
+            raise NotFound(self.invalid_page_message.format(
+                page_number=page_number, message='Invalid page.'
+            ))
+        offset = (page_number - 1) * page_size
+        rows = list(queryset[offset:offset + page_size + 1])
+        if not rows and page_number > 1:
+            raise NotFound(self.invalid_page_message.format(
+                page_number=page_number,
+                message='That page contains no results'
+            ))
+        self.request = request
+        self.page_number = page_number
+        self.has_next = len(rows) > page_size
+        self.display_page_controls = False
+        return rows[:page_size]
+
+    def get_with_count(self, request):
+        value = request.query_params.get(self.count_query_param, '')
+        return value.lower() not in FALSE_VALUES
+
+    def get_paginated_response(self, data):
+        if self.with_count:
+            return super().get_paginated_response(data)
+        return Response(OrderedDict([
+            ('next', self.get_next_link()),
+            ('previous', self.get_previous_link()),
+            ('results', data),
+        ]))
+
+    def get_next_link(self):
+        if self.with_count:
+            return super().get_next_link()
+        if not self.has_next:
+            return None
+        url = self.request.build_absolute_uri()
+        return replace_query_param(url, self.page_query_param,
+                                   self.page_number + 1)
+
+    def get_previous_link(self):
+        if self.with_count:
+            return super().get_previous_link()
+        if self.page_number == 1:
+            return None
+        url = self.request.build_absolute_uri()
+        if self.page_number == 2:
+            return remove_query_param(url, self.page_query_param)
+        return replace_query_param(url, self.page_query_param,
+                                   self.page_number - 1)
+
+
+class PubDateCursorPagination(CursorPagination):
+    ordering = '-pub_date'
+    page_size_query_param = 'page_size'
+    max_page_size = settings.MAX_PAGE_SIZE
+
+
+class PageNumberOrCursorPagination(BasePagination):
+    cursor_pagination_class = PubDateCursorPagination
+    page_number_pagination_class = LimitedPageNumberPagination
+
+    def __init__(self):
+        self.cursor_paginator = self.cursor_pagination_class()
+        self.page_number_paginator = self.page_number_pagination_class()
+        self.paginator = self.page_number_paginator
+
+    def paginate_queryset(self, queryset, request, view=None):
+        cursor_param = self.cursor_paginator.cursor_query_param
+        if cursor_param in request.query_params:
+            self.paginator = self.cursor_paginator
+        else:
+            self.paginator = self.page_number_paginator
+        return self.paginator.paginate_queryset(queryset, request, view)
+
+    def get_paginated_response(self, data):
+        return self.paginator.get_paginated_response(data)
+
+    def get_paginated_response_schema(self, schema):
+        return self.paginator.get_paginated_response_schema(schema)
+
+    def to_html(self):
+        return self.paginator.to_html()
+
+    def get_results(self, data):
+        return self.paginator.get_results(data)
+
+    def get_schema_fields(self, view):
+        return (self.page_number_paginator.get_schema_fields(view)
+                + self.cursor_paginator.get_schema_fields(view))
+
+    def get_schema_operation_parameters(self, view):
+        return (
+            self.page_number_paginator.get_schema_operation_parameters(view)
+            + self.cursor_paginator.get_schema_operation_parameters(view)
+        )
+
+    @property
+    def display_page_controls(self):
+        return getattr(self.paginator, 'display_page_controls', False)
@@ -0,0 +1,154 @@
+from django.http import StreamingHttpResponse
+from rest_framework import serializers
+from rest_framework.response import Response
+
+from .fieldsets import get_sparse_fields
+from .models import Title
+
+
+class ValuesReader:
+    fields = ()
+    columns = {}
+    required_columns = ('id',)
+
+    def __init__(self, request):
+        self.fields = get_sparse_fields(request, self.fields)
+        self.getters = [
+            (name, getattr(self, f'get_{name}', None)) for name in self.fields
+        ]
+
+    def get_queryset(self, queryset):
+        columns = set(self.required_columns)
+        for name in self.fields:
+            columns.update(self.columns.get(name, (name,)))
+        return queryset.prefetch_related(None).values(*columns)
+
+    def prepare(self, rows):
+        pass
+
+    def to_representation(self, rows):
+        rows = list(rows)
+        self.prepare(rows)
+        return self.represent(rows)
+
+    def represent(self, rows):
+        return [
+            {name: getter(row) if getter else row[name]
+             for name, getter in self.getters}
+            for row in rows
+        ]
+
+
+class PubDateValuesReader(ValuesReader):
+    columns = {'author': ('author__username',)}
+    required_columns = ('id', 'pub_date')
+
+    def __init__(self, request):
+        super().__init__(request)
+        self.date_field = serializers.DateTimeField()
+
+    def get_author(self, row):
+        return row['author__username']
+
+    def get_pub_date(self, row):
+        return self.date_field.to_representation(row['pub_date'])
+
+
+class TitleValuesReader(ValuesReader):
+    fields = ('id', 'name', 'year', 'genre', 'rating',
+              'category', 'description')
+    columns = {
+        'rating': ('rating_sum', 'rating_count'),
+        'category': ('category__name', 'category__slug'),
+        'genre': (),
+    }
+
+    def prepare(self, rows):
+        self.genres = {}
+        if 'genre' not in self.fields or not rows:
+            return
+        title_genres = Title.genre.through.objects.filter(
+            title_id__in=[row['id'] for row in rows]
+        ).order_by('-genre_id').values_list('title_id', 'genre__name',
+                                            'genre__slug')
+        for title_id, name, slug in title_genres:
+            self.genres.setdefault(title_id, []).append(
+                {'name': name, 'slug': slug}
+            )
+
+    def get_genre(self, row):
+        return self.genres.get(row['id'], [])
+
+    def get_rating(self, row):
+        if not row['rating_count']:
+            return None
+        return float(row['rating_sum'] / row['rating_count'])
+
+    def get_category(self, row):
+        if row['category__slug'] is None:
+            return None
+        return {'name': row['category__name'],
+                'slug': row['category__slug']}
+
+
+class ReviewValuesReader(PubDateValuesReader):
+    fields = ('id', 'text', 'author', 'score', 'pub_date')
+
+
+class CommentValuesReader(PubDateValuesReader):
+    fields = ('id', 'text', 'author', 'pub_date')
+
+
+class ValuesReadMixin:
+    values_reader_class = None
+    stream_query_param = 'stream'
+    stream_chunk_size = 100
+
+    def list(self, request, *args, **kwargs):
+        if self.values_reader_class is None:
+            return super().list(request, *args, **kwargs)
+        reader = self.values_reader_class(request)
+        queryset = reader.get_queryset(
+            self.filter_queryset(self.get_queryset())
+        )
+        page = self.paginate_queryset(queryset)
+        if self.should_stream(request):
+            return self.stream_response(reader, page, queryset)
+        if page is not None:
+            return self.get_paginated_response(reader.to_representation(page))
+        return Response(reader.to_representation(queryset))
+
+    def should_stream(self, request):
+        value = request.query_params.get(self.stream_query_param, '')
+        return (value.lower() in ('1', 'true', 'yes')
+                and request.accepted_renderer.format == 'json')
+
+    def stream_response(self, reader, page, queryset):
+        """
+        Отдаёт список по частям: обёртка пагинации рендерится отдельно,
+        элементы — порциями по stream_chunk_size.
+        """
+        renderer = self.request.accepted_renderer
+        if page is not None:
+            envelope = renderer.render(self.get_paginated_response([]).data)
+        else:
+            envelope = b'[]'
+        head, _, tail = envelope.rpartition(b'[]')
+        rows = list(page if page is not None else queryset)
+        reader.prepare(rows)
+        chunk_size = self.stream_chunk_size
+
+        def content():
+            yield head + b'['
+            for start in range(0, len(rows), chunk_size):
+                chunk = renderer.render(
+                    reader.represent(rows[start:start + chunk_size])
+                )
+                yield (b',' if start else b'') + chunk[1:-1]
+            yield b']' + tail
+
+        response = StreamingHttpResponse(content(),
+                                         content_type=renderer.media_type)
+        for name, value in self.headers.items():
+            response[name] = value
+        return response
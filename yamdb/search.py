@@ -0,0 +1,97 @@
+import re
+
+from django.conf import settings
+from django.db import connection
+from django.db.models import Case, IntegerField, Q, Value, When
+from django.utils.module_loading import import_string
+
+FTS_TABLE = 'yamdb_title_fts'
+
+
+class TitleSearchBackend:
+
+    def index(self, titles):
+        pass
+
+    def remove(self, title_ids):
+        pass
+
+    def rebuild(self):
+        pass
+
+    def search(self, queryset, query):
+        raise NotImplementedError
+
+
+class SimpleTitleSearchBackend(TitleSearchBackend):
+
+    def search(self, queryset, query):
+        return queryset.filter(
+            Q(name__icontains=query) | Q(description__icontains=query)
+        ).annotate(
+            search_rank=Case(
+                When(name__icontains=query, then=Value(0)),
+                default=Value(1),
+                output_field=IntegerField()
+            )
+        ).order_by('search_rank', '-id')
+
+
+class SQLiteTitleSearchBackend(TitleSearchBackend):
+    name_weight = 10.0
+    description_weight = 1.0
+
+    def index(self, titles):
+        rows = [(title.pk, title.name, title.description) for title in titles]
+        if not rows:
+            return
+        with connection.cursor() as cursor:
+            cursor.executemany(
+                f'DELETE FROM {FTS_TABLE} WHERE rowid = %s',
+                [(row[0],) for row in rows]
+            )
+            cursor.executemany(
+                f'INSERT INTO {FTS_TABLE} (rowid, name, description) '
+                f'VALUES (%s, %s, %s)',
+                rows
+            )
+
+    def remove(self, title_ids):
+        with connection.cursor() as cursor:
+            cursor.executemany(
+                f'DELETE FROM {FTS_TABLE} WHERE rowid = %s',
+                [(title_id,) for title_id in title_ids]
+            )
+
+    def rebuild(self):
+        with connection.cursor() as cursor:
+            cursor.execute(f'DELETE FROM {FTS_TABLE}')
+            cursor.execute(
+                f'INSERT INTO {FTS_TABLE} (rowid, name, description) '
+                f'SELECT id, name, description FROM yamdb_title'
+            )
+
+    def search(self, queryset, query):
+        terms = re.findall(r'\w+', query)
+        if not terms:
+            return queryset.none()
+        match = ' '.join(f'"{term}"*' for term in terms)
+        return queryset.extra(
+            tables=[FTS_TABLE],
+            where=[f'{FTS_TABLE}.rowid = yamdb_title.id',
+                   f'{FTS_TABLE} MATCH %s'],
+            params=[match],
+            select={'search_rank': f'bm25({FTS_TABLE}, '
+                                   f'{self.name_weight}, '
+                                   f'{self.description_weight})'},
+            order_by=['search_rank', '-id']
+        )
+
+
+def get_search_backend():
+    backend_path = getattr(settings, 'TITLE_SEARCH_BACKEND', None)
+    if backend_path:
+        return import_string(backend_path)()
+    if connection.vendor == 'sqlite':
+        return SQLiteTitleSearchBackend()
+    return SimpleTitleSearchBackend()
@@ -1,11 +1,13 @@
 from django.contrib.auth import get_user_model
 from django.contrib.auth.tokens import default_token_generator
-from rest_framework import serializers, status
+from django.db import IntegrityError, transaction
+from rest_framework import serializers
 from rest_framework.exceptions import ValidationError
 from rest_framework.generics import get_object_or_404
-from rest_framework.response import Response
+from rest_framework.settings import api_settings
 from rest_framework_simplejwt.serializers import TokenObtainPairSerializer
 
+from .fieldsets import SparseFieldsetSerializerMixin
 from .models import Category, Comment, Genre, Review, Title
 
 User = get_user_model()
@@ -33,13 +35,22 @@ class TokenObtainPairNoPasswordSerializer(TokenObtainPairSerializer):
         super().__init__(*args, **kwargs)
         self.fields['password'].required = False
 
+    @classmethod
+    def get_token(cls, user):
+        token = super().get_token(user)
+        token['username'] = user.username
+        token['role'] = user.role
+        return token
+
     def validate(self, attrs):
         attrs.update({'password': ''})
         user = get_object_or_404(User, email=attrs.get('email'))
         confirmation_code = attrs.get('confirmation_code')
-        if default_token_generator.check_token(user, confirmation_code):
-            return Response({'detail': f'{confirmation_code} is not a valid confirmation code'},
-                            status=status.HTTP_400_BAD_REQUEST)
+        if not default_token_generator.check_token(user, confirmation_code):
+            raise ValidationError({
+                'confirmation_code': (f'{confirmation_code} is not a valid '
+                                      'confirmation code')
+            })
         return super().validate(attrs)
 
 
@@ -57,11 +68,12 @@ class GenresSerializer(serializers.ModelSerializer):
         model = Genre
 
 
-class TitleReadSerializer(serializers.ModelSerializer):
+class TitleReadSerializer(SparseFieldsetSerializerMixin,
+                          serializers.ModelSerializer):
     genre = GenresSerializer(many=True,
                              read_only=True)
     category = CategoriesSerializer(read_only=True)
-    rating = serializers.FloatField()
+    rating = serializers.FloatField(read_only=True)
 
     class Meta:
         fields = ('id', 'name', 'year', 'genre', 'rating',
@@ -89,7 +101,8 @@ class TitleWriteSerializer(serializers.ModelSerializer):
         model = Title
 
 
-class ReviewSerializer(serializers.ModelSerializer):
+class ReviewSerializer(SparseFieldsetSerializerMixin,
+                       serializers.ModelSerializer):
     author = serializers.SlugRelatedField(read_only=True,
                                           slug_field='username')
 
@@ -98,19 +111,23 @@ class ReviewSerializer(serializers.ModelSerializer):
         read_only_fields = ('id', 'author', 'pub_date')
         model = Review
 
-    def validate(self, data):
-        if self.context['view'].action != 'create':
-            return data
-        title_id = self.context['view'].kwargs.get('title_id')
-        user = self.context['request'].user
-        if Review.objects.filter(author=user,
-                                 title_id=title_id).exists():
-            raise ValidationError('Отзыв уже был оставлен.')
-
-        return data
-
-
-class CommentSerializer(serializers.ModelSerializer):
+    def create(self, validated_data):
+        # Повторный отзыв отсекает ограничение unique_review_author_title.
+        try:
+            with transaction.atomic():
+                return super().create(validated_data)
+        except IntegrityError:
+            if not Review.objects.filter(
+                    author=validated_data['author'],
+                    title=validated_data['title']).exists():
+                raise
+            raise ValidationError({
+                api_settings.NON_FIELD_ERRORS_KEY: ['Отзыв уже был оставлен.']
+            })
+
+
+class CommentSerializer(SparseFieldsetSerializerMixin,
+                        serializers.ModelSerializer):
     author = serializers.SlugRelatedField(slug_field='username',
                                           read_only=True)
 
@@ -0,0 +1,107 @@
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.db.models.signals import (m2m_changed, post_delete, post_save,
+                                      pre_save)
+from django.dispatch import receiver
+
+from .authentication import bump_user_version, user_cache
+from .caching import bump_on_commit
+from .models import Category, Comment, Genre, Review, Title
+from .search import get_search_backend
+
+User = get_user_model()
+
+
+@receiver([post_save, post_delete], sender=User)
+def invalidate_user(sender, instance, **kwargs):
+    user_id = instance.pk
+
+    def invalidate():
+        bump_user_version(user_id)
+        user_cache.delete(user_id)
+    transaction.on_commit(invalidate)
+
+
+@receiver(post_save, sender=User)
+def invalidate_usernames(sender, instance, created, **kwargs):
+    # Из пользователя в отзывах и комментариях выводится только username.
+    # Новые пользователи и удалённые (их отзывы удаляются каскадно и
+    # меняют версию произведения) ETag списков не затрагивают.
+    old_username = instance.get_loaded_value('username')
+    if not created and old_username != instance.username:
+        bump_on_commit('users')
+    instance.remember_loaded_values()
+
+
+@receiver([post_save, post_delete], sender=Category)
+def invalidate_categories(sender, **kwargs):
+    bump_on_commit('categories')
+
+
+@receiver([post_save, post_delete], sender=Genre)
+def invalidate_genres(sender, **kwargs):
+    bump_on_commit('genres')
+
+
+@receiver([post_save, post_delete], sender=Title)
+@receiver(m2m_changed, sender=Title.genre.through)
+def invalidate_titles(sender, **kwargs):
+    bump_on_commit('titles')
+
+
+@receiver([post_save, post_delete], sender=Review)
+def invalidate_rating(sender, **kwargs):
+    bump_on_commit('titles')
+
+
+@receiver(pre_save, sender=Review)
+@receiver(pre_save, sender=Comment)
+def load_previous_values(sender, instance, **kwargs):
+    # Объект создан не из БД: прежние значения нужны для пересчёта.
+    if instance._state.adding or hasattr(instance, '_loaded_values'):
+        return
+    previous = sender.objects.filter(pk=instance.pk).first()
+    instance._loaded_values = (previous._loaded_values
+                               if previous is not None else {})
+
+
+@receiver(post_save, sender=Review)
+def change_review_score(sender, instance, created, **kwargs):
+    old_title_id = instance.get_loaded_value('title_id')
+    old_score = instance.get_loaded_value('score')
+    if created or old_title_id is None:
+        Review.change_score(instance.title_id, new_score=instance.score)
+    elif old_title_id == instance.title_id:
+        Review.change_score(instance.title_id, old_score, instance.score)
+    else:
+        Review.change_score(old_title_id, old_score=old_score)
+        Review.change_score(instance.title_id, new_score=instance.score)
+    instance.remember_loaded_values()
+
+
+@receiver(post_delete, sender=Review)
+def remove_review_score(sender, instance, **kwargs):
+    Review.change_score(instance.title_id, old_score=instance.score)
+
+
+@receiver(post_save, sender=Comment)
+def bump_comment_title(sender, instance, **kwargs):
+    old_title_id = instance.get_loaded_value('title_id')
+    for title_id in {old_title_id, instance.title_id} - {None}:
+        Title.bump_version(title_id)
+    instance.remember_loaded_values()
+
+
+@receiver(post_delete, sender=Comment)
+def bump_deleted_comment_title(sender, instance, **kwargs):
+    Title.bump_version(instance.title_id)
+
+
+@receiver(post_save, sender=Title)
+def index_title(sender, instance, **kwargs):
+    get_search_backend().index([instance])
+
+
+@receiver(post_delete, sender=Title)
+def remove_title_from_index(sender, instance, **kwargs):
+    get_search_backend().remove([instance.pk])
@@ -0,0 +1,93 @@
+from rest_framework.throttling import SimpleRateThrottle
+
+WRITE_METHODS = ('POST', 'PUT', 'PATCH', 'DELETE')
+
+
+class SlidingWindowRateThrottle(SimpleRateThrottle):
+    """
+    Скользящее окно из двух счётчиков: текущего и предыдущего окна.
+
+    Число запросов оценивается как сумма текущего счётчика и доли
+    предыдущего, ещё попадающей в окно. Проверка — get_many обоих
+    счётчиков и для принятого запроса incr текущего (первый запрос окна
+    создаёт счётчик через add): два обращения к кэшу.
+
+    Нужен кэш с атомарным incr, сохраняющим срок жизни ключа (memcached,
+    LocMemCache). В кэшах, где incr — это get и set (файловый, БД),
+    параллельные запросы могут пройти сверх лимита, а set сбросит срок
+    жизни счётчика на TIMEOUT кэша.
+    """
+    cache_format = 'yamdb:throttle:{scope}:{ident}:{window}'
+    methods = None
+
+    def get_cache_key(self, request, view):
+        if request.user and request.user.is_authenticated:
+            ident = request.user.pk
+        else:
+            ident = self.get_ident(request)
+        return self.cache_format.format(scope=self.scope, ident=ident,
+                                        window='{}')
+
+    def allow_request(self, request, view):
+        if self.rate is None:
+            return True
+        if self.methods is not None and request.method not in self.methods:
+            return True
+        key = self.get_cache_key(request, view)
+        if key is None:
+            return True
+
+        now = self.timer()
+        window, elapsed = divmod(now, self.duration)
+        current_key = key.format(int(window))
+        previous_key = key.format(int(window) - 1)
+        counters = self.cache.get_many([previous_key, current_key])
+        self.previous = counters.get(previous_key, 0)
+        self.current = counters.get(current_key, 0)
+        self.elapsed = elapsed
+        weight = 1 - elapsed / self.duration
+        if self.previous * weight + self.current + 1 > self.num_requests:
+            return self.throttle_failure()
+
+        if self.current and self.incr_counter(current_key):
+            return self.throttle_success()
+        if not self.cache.add(current_key, 1, self.duration * 2):
+            self.incr_counter(current_key)
+        return self.throttle_success()
+
+    def incr_counter(self, key):
+        try:
+            return self.cache.incr(key)
+        except ValueError:
+            return None
+
+    def throttle_success(self):
+        return True
+
+    def wait(self):
+        free = self.num_requests - 1
+        if self.current <= free:
+            return max(
+                self.duration * (1 - (free - self.current) / self.previous)
+                - self.elapsed, 0
+            )
+        return (self.duration - self.elapsed
+                + self.duration * (1 - free / self.current))
+
+
+class AuthEmailThrottle(SlidingWindowRateThrottle):
+    scope = 'auth_email'
+
+
+class AuthTokenThrottle(SlidingWindowRateThrottle):
+    scope = 'auth_token'
+
+
+class ContentCreateThrottle(SlidingWindowRateThrottle):
+    scope = 'content_create'
+    methods = ('POST',)
+
+
+class AdminWriteThrottle(SlidingWindowRateThrottle):
+    scope = 'admin_write'
+    methods = WRITE_METHODS
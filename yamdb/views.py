@@ -1,25 +1,40 @@
+from django.conf import settings
 from django.contrib.auth import get_user_model
 from django.contrib.auth.tokens import default_token_generator
-from django.core.mail import mail_admins, send_mail
-from django.db.models import Avg
+from django.db import transaction
+from django.db.models import Exists, F, FloatField, OuterRef
+from django.db.models.functions import Cast, NullIf
 from django_filters import FilterSet
-from django_filters.filters import CharFilter
+from django_filters.filters import BaseInFilter, CharFilter, ChoiceFilter
 from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework import filters, mixins, status
 from rest_framework.decorators import action
 from rest_framework.generics import CreateAPIView, get_object_or_404
-from rest_framework.permissions import IsAuthenticated
+from rest_framework.permissions import AllowAny, IsAuthenticated
 from rest_framework.response import Response
 from rest_framework.viewsets import GenericViewSet, ModelViewSet
 from rest_framework_simplejwt.views import TokenViewBase
 
-from .models import Category, Comment, Genre, Review, Title
+from .authentication import get_or_create_user
+from .bulk import (create_slugged, create_titles, update_slugged,
+                   update_titles)
+from .caching import CachedListMixin, ConditionalGetMixin, bump_version
+from .fieldsets import SparseFieldsetMixin
+from .mail import enqueue_mail
+from .models import (Category, Comment, Genre, Review, Title, TitleRanking,
+                     TitleScore)
+from .pagination import PageNumberOrCursorPagination
 from .permissions import IsAdmin, IsAdminOrReadOnly, IsAuthorOrModerator
+from .readers import (CommentValuesReader, ReviewValuesReader,
+                      TitleValuesReader, ValuesReadMixin)
+from .search import get_search_backend
 from .serializers import (CategoriesSerializer, CommentSerializer,
                           EmailSerializer, GenresSerializer, ReviewSerializer,
                           TitleReadSerializer, TitleWriteSerializer,
                           TokenObtainPairNoPasswordSerializer,
                           UsersSerializer)
+from .throttling import (AdminWriteThrottle, AuthEmailThrottle,
+                         AuthTokenThrottle, ContentCreateThrottle)
 
 User = get_user_model()
 
@@ -31,30 +46,58 @@ class MixinsViewSet(mixins.ListModelMixin,
     pass
 
 
+class BulkWriteMixin:
+    """
+    POST/PATCH {prefix}/bulk/. По умолчанию пишет объекты со slug;
+    bulk_create_items и bulk_update_items переопределяются для других
+    моделей.
+    """
+
+    def bulk_create_items(self, items):
+        return create_slugged(self.get_queryset().model, items)
+
+    def bulk_update_items(self, items):
+        return update_slugged(self.get_queryset().model, items)
+
+    @action(detail=False, methods=['POST', 'PATCH'], url_path='bulk')
+    def bulk(self, request):
+        if request.method == 'POST':
+            result, errors = self.bulk_create_items(request.data)
+        else:
+            result, errors = self.bulk_update_items(request.data)
+        if errors:
+            return Response(errors, status=status.HTTP_400_BAD_REQUEST)
+        bump_version(self.cache_namespace)
+        if request.method == 'POST':
+            return Response(result, status=status.HTTP_201_CREATED)
+        return Response(result)
+
+
 class AuthEmailConfirmation(CreateAPIView):
+    permission_classes = [AllowAny]
+    throttle_classes = [AuthEmailThrottle]
 
     def post(self, request, *args, **kwargs):
         serializer = EmailSerializer(data=request.data)
         serializer.is_valid(raise_exception=True)
-        user = User.objects.get(email=serializer.validated_data.get('email'))
+        user = get_or_create_user(serializer.validated_data.get('email'))
         token = default_token_generator.make_token(user)
         subject = 'Confirmation code'
-        message = {
-            'user': user,
-            'confirmation_code': token,
-        }
-        send_mail(subject, message, mail_admins, [user.email], fail_silently=False)
-        return Response({'message': message}, status=status.HTTP_200_OK)
+        message = f'Confirmation code: {token}'
+        enqueue_mail(subject, message, [user.email])
+        return Response({'email': user.email}, status=status.HTTP_200_OK)
 
 
 class TokenObtainPairNoPasswordView(TokenViewBase):
     serializer_class = TokenObtainPairNoPasswordSerializer
+    throttle_classes = [AuthTokenThrottle]
 
 
 class UsersViewSet(ModelViewSet):
     queryset = User.objects.all()
     serializer_class = UsersSerializer
     permission_classes = [IsAuthenticated, IsAdmin]
+    throttle_classes = [AdminWriteThrottle]
     lookup_field = 'username'
 
     @action(detail=False, methods=['GET', 'PATCH'],
@@ -71,85 +114,241 @@ class UsersViewSet(ModelViewSet):
         return Response(serializer.data)
 
 
+class CharInFilter(BaseInFilter, CharFilter):
+    pass
+
+
 class TitlesFilter(FilterSet):
-    genre = CharFilter(field_name='genre__slug',
-                       lookup_expr='icontains')
-    category = CharFilter(field_name='category__slug',
-                          lookup_expr='icontains')
+    GENRE_MATCH_ANY = 'any'
+    GENRE_MATCH_ALL = 'all'
+
+    genre = CharInFilter(method='filter_genre')
+    genre_match = ChoiceFilter(choices=((GENRE_MATCH_ANY, GENRE_MATCH_ANY),
+                                        (GENRE_MATCH_ALL, GENRE_MATCH_ALL)),
+                               method='filter_genre_match')
+    category = CharInFilter(field_name='category__slug',
+                            lookup_expr='in')
     name = CharFilter(field_name='name',
                       lookup_expr='icontains')
+    search = CharFilter(method='filter_search')
+    ordering = ChoiceFilter(choices=[(value, value) for value in (
+        'rating', '-rating', 'review_count', '-review_count'
+    )], method='filter_ordering')
 
     class Meta:
         model = Title
         fields = ['year']
 
+    def filter_genre(self, queryset, name, value):
+        slugs = set(value)
+        title_genres = Title.genre.through.objects.filter(
+            title_id=OuterRef('pk')
+        )
+        match = self.form.cleaned_data.get('genre_match')
+        if match == self.GENRE_MATCH_ALL:
+            for slug in slugs:
+                queryset = queryset.filter(
+                    Exists(title_genres.filter(genre__slug=slug))
+                )
+            return queryset
+        return queryset.filter(
+            Exists(title_genres.filter(genre__slug__in=slugs))
+        )
+
+    def filter_genre_match(self, queryset, name, value):
+        return queryset
+
+    def filter_search(self, queryset, name, value):
+        return get_search_backend().search(queryset, value)
 
-class TitlesViewSet(ModelViewSet):
-    queryset = Title.objects.all().annotate(rating=Avg('reviews__score'))
+    def filter_ordering(self, queryset, name, value):
+        # Сортировка по сохранённым rating_sum/rating_count, без агрегации
+        # отзывов.
+        if value.lstrip('-') == 'rating':
+            expression = (Cast('rating_sum', FloatField())
+                          / NullIf('rating_count', 0))
+        else:
+            expression = F('rating_count')
+        if value.startswith('-'):
+            expression = expression.desc(nulls_last=True)
+        else:
+            expression = expression.asc(nulls_last=True)
+        return queryset.order_by(expression, '-id')
+
+
+class TitlesViewSet(ConditionalGetMixin, ValuesReadMixin, SparseFieldsetMixin,
+                    BulkWriteMixin, ModelViewSet):
+    queryset = Title.objects.select_related(
+        'category'
+    ).prefetch_related('genre')
     permission_classes = [IsAdminOrReadOnly, ]
+    throttle_classes = [AdminWriteThrottle]
     filter_backends = [DjangoFilterBackend]
     filterset_class = TitlesFilter
+    sparse_columns = {
+        'rating': ('rating_sum', 'rating_count'),
+        'category': ('category', 'category__name', 'category__slug'),
+        'genre': (),
+    }
+    sparse_select_related = {'category': 'category'}
+    sparse_prefetch_related = {'genre': 'genre'}
+    values_reader_class = TitleValuesReader
+    condition_namespaces = ('titles', 'categories', 'genres')
+    cache_namespace = 'titles'
 
     def get_serializer_class(self):
         if self.action in ('list', 'retrieve'):
             return TitleReadSerializer
         return TitleWriteSerializer
 
+    def bulk_create_items(self, items):
+        return create_titles(items)
+
+    def bulk_update_items(self, items):
+        return update_titles(items)
+
+    @action(detail=False, methods=['GET'])
+    def top(self, request):
+        category = request.query_params.get('category')
+        genre = request.query_params.get('genre')
+        if category and genre:
+            return Response(
+                {'non_field_errors': ['Укажите category или genre.']},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        try:
+            limit = int(request.query_params.get('limit', 10))
+            if limit < 1:
+                raise ValueError
+        except ValueError:
+            return Response({'limit': ['Ожидается положительное число.']},
+                            status=status.HTTP_400_BAD_REQUEST)
+        if category:
+            rankings = TitleRanking.objects.filter(category__slug=category,
+                                                   genre=None)
+        elif genre:
+            rankings = TitleRanking.objects.filter(category=None,
+                                                   genre__slug=genre)
+        else:
+            rankings = TitleRanking.objects.filter(category=None, genre=None)
+        ranked = rankings.values_list('title_id', 'weighted_rating')[
+            :min(limit, settings.TOP_TITLES_SIZE)
+        ]
+        weighted = dict(ranked)
+        positions = {pk: position for position, pk in enumerate(weighted)}
+        reader = TitleValuesReader(request)
+        rows = sorted(
+            reader.get_queryset(Title.objects.filter(pk__in=weighted)),
+            key=lambda row: positions[row['id']]
+        )
+        data = reader.to_representation(rows)
+        for item, row in zip(data, rows):
+            item['weighted_rating'] = weighted[row['id']]
+        return Response(data)
+
+    @action(detail=True, methods=['GET'])
+    def stats(self, request, pk=None):
+        get_object_or_404(Title.objects.only('id'), pk=pk)
+        return Response(TitleScore.stats(pk))
+
 
-class CategoriesListCreateDestroyViewSet(MixinsViewSet):
+class CategoriesListCreateDestroyViewSet(CachedListMixin, BulkWriteMixin,
+                                         MixinsViewSet):
     queryset = Category.objects.all()
     serializer_class = CategoriesSerializer
     permission_classes = [IsAdminOrReadOnly, ]
+    throttle_classes = [AdminWriteThrottle]
     filter_backends = [filters.SearchFilter]
     search_fields = ['name', ]
     lookup_field = 'slug'
+    cache_namespace = 'categories'
 
 
-class GenresListCreateDestroyViewSet(MixinsViewSet):
+class GenresListCreateDestroyViewSet(CachedListMixin, BulkWriteMixin,
+                                     MixinsViewSet):
     queryset = Genre.objects.all()
     serializer_class = GenresSerializer
     permission_classes = [IsAdminOrReadOnly, ]
+    throttle_classes = [AdminWriteThrottle]
     filter_backends = [filters.SearchFilter]
     search_fields = ['name', ]
     lookup_field = 'slug'
+    cache_namespace = 'genres'
 
 
-class ReviewViewSet(ModelViewSet):
+class ReviewViewSet(ConditionalGetMixin, ValuesReadMixin, SparseFieldsetMixin,
+                    ModelViewSet):
     serializer_class = ReviewSerializer
     permission_classes = [IsAdminOrReadOnly | IsAuthorOrModerator, ]
+    pagination_class = PageNumberOrCursorPagination
+    throttle_classes = [ContentCreateThrottle]
+    sparse_required_columns = ('id', 'title', 'pub_date')
+    sparse_columns = {'author': ('author', 'author__username')}
+    sparse_select_related = {'author': 'author'}
+    values_reader_class = ReviewValuesReader
+    condition_namespaces = ('users',)
 
     def get_queryset(self):
-        return self.get_current_title().reviews.all()
+        return self.get_current_title().reviews.select_related('author')
 
     def perform_create(self, serializer):
         serializer.save(author=self.request.user,
                         title=self.get_current_title())
 
+    @transaction.atomic
+    def perform_update(self, serializer):
+        serializer.save()
+
+    def get_condition_state(self):
+        title = self.get_current_title()
+        return (title.pk, title.version), title.modified
+
     def get_current_title(self):
-        return get_object_or_404(Title,
-                                 pk=self.kwargs.get('title_id'))
+        if not hasattr(self, '_current_title'):
+            self._current_title = get_object_or_404(
+                Title, pk=self.kwargs.get('title_id')
+            )
+        return self._current_title
 
 
-class CommentsViewSet(ModelViewSet):
+class CommentsViewSet(ConditionalGetMixin, ValuesReadMixin,
+                      SparseFieldsetMixin, ModelViewSet):
     serializer_class = CommentSerializer
     permission_classes = [IsAdminOrReadOnly | IsAuthorOrModerator]
+    pagination_class = PageNumberOrCursorPagination
+    throttle_classes = [ContentCreateThrottle]
+    sparse_required_columns = ('id', 'pub_date')
+    sparse_columns = {'author': ('author', 'author__username')}
+    sparse_select_related = {'author': 'author'}
+    values_reader_class = CommentValuesReader
+    condition_namespaces = ('users',)
 
     def get_queryset(self):
-        title = get_object_or_404(Title,
-                                  pk=self.kwargs.get('title_id'))
-        review = get_object_or_404(Review,
-                                   pk=self.kwargs.get('review_id'),
-                                   title__id=self.kwargs.get('title_id'))
-        queryset = Comment.objects.filter(title=title,
-                                          review=review).all()
-        return queryset
+        return Comment.objects.filter(
+            review=self.get_current_review()
+        ).select_related('author')
 
+    @transaction.atomic
     def perform_create(self, serializer):
-        title = get_object_or_404(Title,
-                                  pk=self.kwargs.get('title_id'))
-        review = get_object_or_404(Review,
-                                   pk=self.kwargs.get('review_id'),
-                                   title__id=self.kwargs.get('title_id'))
+        review = self.get_current_review()
         serializer.save(author=self.request.user,
-                        title=title,
+                        title_id=review.title_id,
                         review=review)
+
+    @transaction.atomic
+    def perform_update(self, serializer):
+        serializer.save()
+
+    def get_condition_state(self):
+        review = self.get_current_review()
+        return (review.title_id, review.title_version), review.title_modified
+
+    def get_current_review(self):
+        if not hasattr(self, '_current_review'):
+            self._current_review = get_object_or_404(
+                Review.objects.annotate(title_version=F('title__version'),
+                                        title_modified=F('title__modified')),
+                pk=self.kwargs.get('review_id'),
+                title_id=self.kwargs.get('title_id')
+            )
+        return self._current_review